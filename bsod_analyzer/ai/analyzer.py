@@ -4,11 +4,17 @@ AI analysis engine.
 Integrates with ZhipuAI to provide intelligent crash analysis.
 """
 
-from typing import Optional, List, Dict, Any
+import asyncio
+from typing import Optional, List, Dict, Any, Iterator
 from loguru import logger
 
 from bsod_analyzer.ai.providers import IAIProvider, AIProviderFactory
 from bsod_analyzer.ai.prompts import PromptTemplates
+from bsod_analyzer.ai.playbooks import (
+    KNOWN_BUGCHECK_PLAYBOOKS,
+    get_playbook,
+    stack_top_is_stock,
+)
 from bsod_analyzer.database.models import (
     CrashInfo,
     DriverInfo,
@@ -30,6 +36,11 @@ class AIAnalyzer:
         self.provider = provider
         self.prompts = prompts or PromptTemplates()
         self._enabled = provider is not None and provider.is_available()
+        # Single-entry context cache: multi-prompt workflows over the
+        # same crash reuse the formatted driver list / stack text
+        # instead of re-formatting them per prompt.
+        self._context_key: Optional[tuple] = None
+        self._context: Optional[Dict[str, Any]] = None
 
     @property
     def enabled(self) -> bool:
@@ -59,6 +70,12 @@ class AIAnalyzer:
         if not self.enabled:
             return "AI analysis is not available. Please configure ZHIPU_API_KEY."
 
+        # Well-known bugcheck with no third-party driver implicated:
+        # return the canned playbook instead of paying for an LLM call.
+        playbook = self._lookup_playbook(crash_info, stack_traces, suspected_driver)
+        if playbook is not None:
+            return playbook
+
         # Build context
         context = self._build_context(
             crash_info, drivers, stack_traces, minidump_info, suspected_driver
@@ -70,13 +87,192 @@ class AIAnalyzer:
         # Call AI
         try:
             logger.info("Requesting AI analysis...")
-            result = self.provider.analyze(prompt)
+            result = self.provider.analyze(prompt, system=self.prompts.analysis_system_prompt)
             logger.info("AI analysis complete")
             return result
         except Exception as e:
             logger.error(f"AI analysis failed: {e}")
             return f"AI analysis failed: {e}"
 
+    def analyze_stream(
+        self,
+        crash_info: CrashInfo,
+        drivers: List[DriverInfo],
+        stack_traces: List[StackTrace],
+        minidump_info: MinidumpInfo,
+        suspected_driver: Optional[DriverInfo] = None,
+    ) -> Iterator[str]:
+        """Perform AI analysis of a crash, yielding text as it arrives.
+
+        Same analysis as `analyze`, but streams chunks so callers can
+        display output at time-to-first-token instead of waiting for
+        the full completion.
+
+        Args:
+            crash_info: Crash information
+            drivers: List of loaded drivers
+            stack_traces: Stack traces
+            minidump_info: Minidump information
+            suspected_driver: Suspected problematic driver
+
+        Yields:
+            Chunks of AI analysis text
+        """
+        if not self.enabled:
+            yield "AI analysis is not available. Please configure ZHIPU_API_KEY."
+            return
+
+        playbook = self._lookup_playbook(crash_info, stack_traces, suspected_driver)
+        if playbook is not None:
+            yield playbook
+            return
+
+        context = self._build_context(
+            crash_info, drivers, stack_traces, minidump_info, suspected_driver
+        )
+        prompt = self.prompts.generate_analysis_prompt(context)
+
+        try:
+            logger.info("Requesting streaming AI analysis...")
+            yield from self.provider.analyze_stream(
+                prompt, system=self.prompts.analysis_system_prompt
+            )
+            logger.info("AI analysis complete")
+        except Exception as e:
+            logger.error(f"AI analysis failed: {e}")
+            yield f"AI analysis failed: {e}"
+
+    async def analyze_async(
+        self,
+        crash_info: CrashInfo,
+        drivers: List[DriverInfo],
+        stack_traces: List[StackTrace],
+        minidump_info: MinidumpInfo,
+        suspected_driver: Optional[DriverInfo] = None,
+    ) -> str:
+        """Perform AI analysis of a crash without blocking the event loop.
+
+        Same as `analyze`, but awaitable so multiple analyses can run
+        concurrently via `asyncio.gather`.
+
+        Args:
+            crash_info: Crash information
+            drivers: List of loaded drivers
+            stack_traces: Stack traces
+            minidump_info: Minidump information
+            suspected_driver: Suspected problematic driver
+
+        Returns:
+            AI analysis text
+        """
+        if not self.enabled:
+            return "AI analysis is not available. Please configure ZHIPU_API_KEY."
+
+        playbook = self._lookup_playbook(crash_info, stack_traces, suspected_driver)
+        if playbook is not None:
+            return playbook
+
+        context = self._build_context(
+            crash_info, drivers, stack_traces, minidump_info, suspected_driver
+        )
+        prompt = self.prompts.generate_analysis_prompt(context)
+
+        try:
+            logger.info("Requesting AI analysis...")
+            result = await self.provider.analyze_async(
+                prompt, system=self.prompts.analysis_system_prompt
+            )
+            logger.info("AI analysis complete")
+            return result
+        except Exception as e:
+            logger.error(f"AI analysis failed: {e}")
+            return f"AI analysis failed: {e}"
+
+    async def analyze_drivers_async(
+        self, driver_names: List[str], crash_context: Dict[str, Any]
+    ) -> List[str]:
+        """Analyze several drivers concurrently.
+
+        Fires one request per driver via `asyncio.gather`, so wall time
+        is the slowest single request instead of the sum of all of them.
+
+        Args:
+            driver_names: Names of the drivers to analyze
+            crash_context: Crash context information shared by all drivers
+
+        Returns:
+            List of AI driver analysis texts, in input order
+        """
+        if not self.enabled:
+            return ["AI analysis is not available."] * len(driver_names)
+
+        prompts = [
+            self.prompts.generate_driver_analysis_prompt(name, crash_context)
+            for name in driver_names
+        ]
+
+        try:
+            logger.info(f"Requesting AI analysis for {len(driver_names)} drivers...")
+            results = await asyncio.gather(
+                *(self.provider.analyze_async(p) for p in prompts)
+            )
+            logger.info("AI driver analyses complete")
+            return list(results)
+        except Exception as e:
+            logger.error(f"AI driver analyses failed: {e}")
+            return [f"AI driver analysis failed: {e}"] * len(driver_names)
+
+    def analyze_drivers(
+        self, driver_names: List[str], crash_context: Dict[str, Any]
+    ) -> List[Dict[str, Any]]:
+        """Analyze several drivers in a single LLM round trip.
+
+        Builds one prompt enumerating all drivers over a shared crash
+        context, so N drivers cost one request instead of N.
+
+        Args:
+            driver_names: Names of the drivers to analyze
+            crash_context: Crash context information shared by all drivers
+
+        Returns:
+            List of per-driver analysis dicts, in input order
+        """
+        if not self.enabled:
+            return []
+
+        prompt = self.prompts.generate_batched_driver_analysis_prompt(
+            driver_names, crash_context
+        )
+
+        try:
+            logger.info(f"Requesting batched AI analysis for {len(driver_names)} drivers...")
+            result = self.provider.analyze(prompt, max_tokens=1024)
+            logger.info("Batched AI driver analysis complete")
+            return self._parse_driver_batch(result)
+        except Exception as e:
+            logger.error(f"Batched AI driver analysis failed: {e}")
+            return []
+
+    @staticmethod
+    def _parse_driver_batch(response: str) -> List[Dict[str, Any]]:
+        """Parse the JSON array from a batched driver analysis response."""
+        import json
+
+        text = response.strip()
+        # Strip a Markdown code fence if the model added one
+        if text.startswith("```"):
+            text = text.split("\n", 1)[-1].rsplit("```", 1)[0]
+
+        try:
+            data = json.loads(text)
+            if isinstance(data, list):
+                return data
+            logger.warning("Batched driver analysis returned non-list JSON")
+        except json.JSONDecodeError as e:
+            logger.warning(f"Failed to parse batched driver analysis: {e}")
+
+        return []
+
     def analyze_history(self, crashes: List[Dict[str, Any]]) -> str:
         """Analyze crash patterns from history.
 
@@ -98,7 +294,7 @@ class AIAnalyzer:
         # Call AI
         try:
             logger.info(f"Requesting AI pattern analysis for {len(crashes)} crashes...")
-            result = self.provider.analyze(prompt)
+            result = self.provider.analyze(prompt, max_tokens=1024)
             logger.info("AI pattern analysis complete")
             return result
         except Exception as e:
@@ -124,13 +320,45 @@ class AIAnalyzer:
         # Call AI
         try:
             logger.info(f"Requesting AI driver analysis for: {driver_name}")
-            result = self.provider.analyze(prompt)
+            result = self.provider.analyze(prompt, max_tokens=1024)
             logger.info("AI driver analysis complete")
             return result
         except Exception as e:
             logger.error(f"AI driver analysis failed: {e}")
             return f"AI driver analysis failed: {e}"
 
+    @staticmethod
+    def _lookup_playbook(
+        crash_info: CrashInfo,
+        stack_traces: List[StackTrace],
+        suspected_driver: Optional[DriverInfo],
+    ) -> Optional[str]:
+        """Return a canned report when the crash needs no LLM.
+
+        Applies only when no third-party driver is implicated: no
+        suspected driver, a well-known bugcheck code, and a crash stack
+        topping out in a stock OS module.
+
+        Args:
+            crash_info: Crash information
+            stack_traces: Stack traces
+            suspected_driver: Suspected problematic driver
+
+        Returns:
+            Canned Markdown report, or None if the LLM should run
+        """
+        if (
+            suspected_driver is None
+            and crash_info.bugcheck_code in KNOWN_BUGCHECK_PLAYBOOKS
+            and stack_top_is_stock(stack_traces)
+        ):
+            logger.info(
+                f"Known bugcheck 0x{crash_info.bugcheck_code:02X} with no "
+                "third-party driver implicated, using canned playbook"
+            )
+            return get_playbook(crash_info.bugcheck_code, crash_info.crash_address)
+        return None
+
     def _build_context(
         self,
         crash_info: CrashInfo,
@@ -151,13 +379,22 @@ class AIAnalyzer:
         Returns:
             Context dictionary for prompt generation
         """
+        # The key holds the objects themselves, not their id()s: the
+        # strong references keep the ids alive, so an identity match
+        # can't be a recycled id from a garbage-collected earlier crash
+        key = (crash_info, drivers, stack_traces, minidump_info, suspected_driver)
+        if self._context_key is not None and all(
+            new is old for new, old in zip(key, self._context_key)
+        ):
+            return self._context
+
         # Format drivers list
         driver_list = self.prompts.format_driver_list(drivers, max_drivers=20)
 
         # Format stack traces
         stack_text = self.prompts.format_stack_traces(stack_traces, max_threads=3, max_frames=10)
 
-        return {
+        context = {
             "bugcheck_code": f"0x{crash_info.bugcheck_code:02X}",
             "bugcheck_name": crash_info.bugcheck_name,
             "bugcheck_description": crash_info.bugcheck_description,
@@ -173,6 +410,9 @@ class AIAnalyzer:
             "driver_list": driver_list,
             "stack_traces": stack_text,
         }
+        self._context_key = key
+        self._context = context
+        return context
 
     @classmethod
     def from_config(cls, config) -> "AIAnalyzer":
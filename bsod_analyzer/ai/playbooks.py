@@ -0,0 +1,569 @@
+"""
+Canned analysis playbooks for well-known bugcheck codes.
+
+Well-documented bugchecks with no third-party driver implicated have
+deterministic fixes, so the LLM round trip is skipped and a canned
+report in the same five-section format is returned instantly at zero
+token cost. The LLM stays reserved for unusual crashes.
+"""
+
+from typing import Final, List, Optional
+
+
+#: Stock OS modules: if the crash stack tops out in one of these (or the
+#: stack is empty), no third-party driver is implicated and the canned
+#: playbook applies.
+STOCK_OS_MODULES: Final[frozenset] = frozenset(
+    {
+        "ntoskrnl.exe",
+        "ntkrnlmp.exe",
+        "hal.dll",
+        "win32k.sys",
+        "win32kbase.sys",
+        "win32kfull.sys",
+        "ntfs.sys",
+        "fltmgr.sys",
+        "ndis.sys",
+        "tcpip.sys",
+        "afd.sys",
+        "ci.dll",
+        "clfs.sys",
+        "volmgr.sys",
+        "storport.sys",
+        "classpnp.sys",
+        "acpi.sys",
+        "pci.sys",
+        "wdf01000.sys",
+        "fwpkclnt.sys",
+        "unknown",
+    }
+)
+
+
+#: Canned five-section reports keyed by bugcheck code, matching the
+#: format the LLM is instructed to produce. `{crash_address}` is filled
+#: in by `get_playbook`.
+KNOWN_BUGCHECK_PLAYBOOKS: Final[dict] = {
+    0x0A: """## 一、根因分析
+驱动程序在过高的IRQL下访问了可分页内存（崩溃地址 {crash_address}），最常见原因是驱动过旧或内存故障。
+
+## 二、技术解释
+内核代码在 DISPATCH_LEVEL 及以上中断级别访问了被换出的页面，触发 IRQL_NOT_LESS_OR_EQUAL。
+
+## 三、具体修复步骤（按优先级排序）
+
+### 第一步：更新全部驱动
+**目的**：排除过旧驱动
+**具体操作**：
+1. 打开"设置 → Windows 更新 → 可选更新 → 驱动程序更新"
+2. 勾选全部驱动更新并安装
+3. 重启电脑
+
+**预期结果**：驱动为最新版本
+
+### 第二步：运行内存诊断
+**目的**：排除内存故障
+**具体操作**：
+1. 按 Win+R 输入 mdsched.exe 回车
+2. 选择"立即重新启动并检查问题"
+
+**命令行方式**（如适用）：
+```
+mdsched.exe
+```
+
+**预期结果**：诊断无错误报告
+
+### 第三步：修复系统文件
+**目的**：排除系统文件损坏
+**命令行方式**（如适用）：
+```
+sfc /scannow
+```
+
+**预期结果**：提示未发现完整性冲突或已修复
+
+## 四、验证修复
+
+1. **检查方法**：查看事件查看器中是否仍有 Kernel-Power 41 / BugCheck 事件
+2. **观察时间**：正常使用 3-7 天
+3. **成功标志**：不再出现蓝屏
+
+## 五、如果问题仍未解决
+1. 在干净启动（msconfig 禁用第三方服务）下复现，定位冲突软件
+2. 启用驱动验证程序（verifier.exe）定位问题驱动
+3. 检查内存条插槽，逐条排查硬件""",
+    0xD1: """## 一、根因分析
+某驱动在无效 IRQL 下访问内存（崩溃地址 {crash_address}），通常是网卡或显卡驱动缺陷。
+
+## 二、技术解释
+DRIVER_IRQL_NOT_LESS_OR_EQUAL：驱动在 DISPATCH_LEVEL 引用了无效或可分页地址，多见于网络/图形驱动。
+
+## 三、具体修复步骤（按优先级排序）
+
+### 第一步：更新网卡与显卡驱动
+**目的**：替换有缺陷的驱动版本
+**具体操作**：
+1. 按 Win+X → 设备管理器
+2. 展开"网络适配器"和"显示适配器"
+3. 右键设备 → 更新驱动程序 → 自动搜索
+
+**预期结果**：驱动更新到厂商最新版
+
+### 第二步：回滚最近更新的驱动
+**目的**：排除新驱动引入的缺陷
+**具体操作**：
+1. 设备管理器中右键可疑设备 → 属性 → 驱动程序
+2. 点击"回滚驱动程序"
+
+**预期结果**：恢复到上一稳定版本
+
+### 第三步：更新芯片组驱动
+**目的**：排除总线层问题
+**具体操作**：
+1. 到主板/整机厂商官网下载最新芯片组驱动
+2. 安装后重启
+
+**预期结果**：芯片组驱动为最新
+
+## 四、验证修复
+
+1. **检查方法**：事件查看器 → Windows 日志 → 系统，筛选 BugCheck 事件
+2. **观察时间**：高负载使用 3 天
+3. **成功标志**：无新的 0xD1 蓝屏
+
+## 五、如果问题仍未解决
+1. 启用驱动验证程序（verifier /standard /all）定位具体驱动
+2. 暂时禁用/卸载第三方防火墙与 VPN 虚拟网卡
+3. 检查并更新 BIOS""",
+    0x3B: """## 一、根因分析
+系统服务执行中发生异常（崩溃地址 {crash_address}），常见于显卡驱动或系统文件损坏。
+
+## 二、技术解释
+SYSTEM_SERVICE_EXCEPTION：从用户态进入内核态的系统调用路径中触发未处理异常。
+
+## 三、具体修复步骤（按优先级排序）
+
+### 第一步：更新显卡驱动
+**目的**：排除图形驱动缺陷
+**具体操作**：
+1. 按 Win+X → 设备管理器 → 显示适配器
+2. 右键显卡 → 更新驱动程序 → 自动搜索
+3. 重启电脑
+
+**预期结果**：显卡驱动为最新版
+
+### 第二步：修复系统文件
+**目的**：修复损坏的系统组件
+**命令行方式**（如适用）：
+```
+sfc /scannow
+DISM /Online /Cleanup-Image /RestoreHealth
+```
+
+**预期结果**：提示已修复或无冲突
+
+### 第三步：检查磁盘错误
+**目的**：排除磁盘损坏
+**命令行方式**（如适用）：
+```
+chkdsk C: /f
+```
+
+**预期结果**：下次重启完成检查且无坏道
+
+## 四、验证修复
+
+1. **检查方法**：复现之前触发蓝屏的操作
+2. **观察时间**：正常使用 3-7 天
+3. **成功标志**：不再出现 0x3B 蓝屏
+
+## 五、如果问题仍未解决
+1. 暂时卸载第三方杀毒软件观察
+2. 干净启动排查冲突软件
+3. 运行内存诊断（mdsched.exe）""",
+    0x50: """## 一、根因分析
+引用了无效的系统内存（崩溃地址 {crash_address}），最常见原因是内存条故障或驱动损坏。
+
+## 二、技术解释
+PAGE_FAULT_IN_NONPAGED_AREA：访问的地址不在非分页池的有效范围内，多由坏内存或越界驱动导致。
+
+## 三、具体修复步骤（按优先级排序）
+
+### 第一步：运行内存诊断
+**目的**：排除物理内存故障
+**具体操作**：
+1. 按 Win+R 输入 mdsched.exe 回车
+2. 选择"立即重新启动并检查问题"
+
+**预期结果**：诊断无错误
+
+### 第二步：检查磁盘
+**目的**：排除页面文件所在磁盘损坏
+**命令行方式**（如适用）：
+```
+chkdsk C: /f /r
+```
+
+**预期结果**：重启后检查完成且无错误
+
+### 第三步：更新存储与显卡驱动
+**目的**：排除驱动越界写
+**具体操作**：
+1. 设备管理器 → 磁盘驱动器 / 存储控制器 / 显示适配器
+2. 逐项右键 → 更新驱动程序
+
+**预期结果**：相关驱动为最新
+
+## 四、验证修复
+
+1. **检查方法**：运行内存压力场景（大型游戏/虚拟机）
+2. **观察时间**：3-7 天
+3. **成功标志**：无新的 0x50 蓝屏
+
+## 五、如果问题仍未解决
+1. 逐条拔插内存排查具体内存条/插槽
+2. 暂时卸载第三方杀毒软件
+3. 启用驱动验证程序定位越界驱动""",
+    0x1A: """## 一、根因分析
+内存管理器检测到严重错误（崩溃地址 {crash_address}），多为内存硬件故障或磁盘损坏。
+
+## 二、技术解释
+MEMORY_MANAGEMENT：页表或工作集结构不一致，常由坏 RAM、损坏的页面文件或驱动破坏内存导致。
+
+## 三、具体修复步骤（按优先级排序）
+
+### 第一步：运行内存诊断
+**目的**：排除物理内存故障
+**具体操作**：
+1. 按 Win+R 输入 mdsched.exe 回车
+2. 选择"立即重新启动并检查问题"
+
+**预期结果**：诊断无错误
+
+### 第二步：重建页面文件
+**目的**：排除页面文件损坏
+**具体操作**：
+1. 打开"系统 → 高级系统设置 → 性能设置 → 高级 → 虚拟内存"
+2. 取消自动管理，选择"无分页文件"，重启
+3. 重新改回"系统管理的大小"，再重启
+
+**预期结果**：页面文件重建完成
+
+### 第三步：检查磁盘并更新驱动
+**目的**：排除磁盘损坏与驱动缺陷
+**命令行方式**（如适用）：
+```
+chkdsk C: /f
+```
+
+**预期结果**：磁盘无错误，驱动为最新
+
+## 四、验证修复
+
+1. **检查方法**：事件查看器筛选 BugCheck 事件
+2. **观察时间**：3-7 天
+3. **成功标志**：无新的 0x1A 蓝屏
+
+## 五、如果问题仍未解决
+1. 用 MemTest86 做更彻底的内存测试
+2. 逐条排查内存条
+3. 关闭 XMP/超频后观察""",
+    0x1E: """## 一、根因分析
+内核捕获到未处理异常（崩溃地址 {crash_address}），常见原因是驱动缺陷或内存损坏。
+
+## 二、技术解释
+KMODE_EXCEPTION_NOT_HANDLED：内核态代码触发异常且没有异常处理程序接管。
+
+## 三、具体修复步骤（按优先级排序）
+
+### 第一步：更新全部驱动
+**目的**：替换缺陷驱动
+**具体操作**：
+1. 打开"设置 → Windows 更新 → 可选更新 → 驱动程序更新"
+2. 安装全部驱动更新并重启
+
+**预期结果**：驱动为最新版本
+
+### 第二步：卸载最近安装的软件
+**目的**：排除新软件的内核组件冲突
+**具体操作**：
+1. 打开"设置 → 应用 → 安装的应用"
+2. 按安装日期排序，卸载蓝屏开始前后安装的软件
+3. 重启电脑
+
+**预期结果**：可疑软件已移除
+
+### 第三步：运行内存诊断
+**目的**：排除内存故障
+**命令行方式**（如适用）：
+```
+mdsched.exe
+```
+
+**预期结果**：诊断无错误
+
+## 四、验证修复
+
+1. **检查方法**：事件查看器筛选 BugCheck 事件
+2. **观察时间**：3-7 天
+3. **成功标志**：无新的 0x1E 蓝屏
+
+## 五、如果问题仍未解决
+1. 启用驱动验证程序定位问题驱动
+2. 干净启动排查第三方服务
+3. 运行 sfc /scannow 修复系统文件""",
+    0x7E: """## 一、根因分析
+系统线程触发了未处理异常（崩溃地址 {crash_address}），常见于显卡驱动或系统文件损坏。
+
+## 二、技术解释
+SYSTEM_THREAD_EXCEPTION_NOT_HANDLED：内核线程内的异常未被捕获，多由驱动缺陷引起。
+
+## 三、具体修复步骤（按优先级排序）
+
+### 第一步：更新显卡驱动
+**目的**：排除最常见的图形驱动缺陷
+**具体操作**：
+1. 按 Win+X → 设备管理器 → 显示适配器
+2. 右键显卡 → 更新驱动程序 → 自动搜索
+3. 重启电脑
+
+**预期结果**：显卡驱动为最新
+
+### 第二步：修复系统文件
+**目的**：修复损坏的系统组件
+**命令行方式**（如适用）：
+```
+sfc /scannow
+```
+
+**预期结果**：提示已修复或无冲突
+
+### 第三步：运行内存诊断
+**目的**：排除内存故障
+**命令行方式**（如适用）：
+```
+mdsched.exe
+```
+
+**预期结果**：诊断无错误
+
+## 四、验证修复
+
+1. **检查方法**：复现触发崩溃的场景
+2. **观察时间**：3-7 天
+3. **成功标志**：无新的 0x7E 蓝屏
+
+## 五、如果问题仍未解决
+1. 回滚最近更新过的驱动
+2. 在安全模式下观察是否稳定，定位第三方组件
+3. 启用驱动验证程序定位具体驱动""",
+    0x7F: """## 一、根因分析
+内核产生了无法处理的陷阱（崩溃地址 {crash_address}），常见原因是 CPU 过热、超频或硬件故障。
+
+## 二、技术解释
+UNEXPECTED_KERNEL_MODE_TRAP：CPU 报告了双重错误等内核无法恢复的陷阱，多与硬件状态有关。
+
+## 三、具体修复步骤（按优先级排序）
+
+### 第一步：检查 CPU 温度并清灰
+**目的**：排除过热
+**具体操作**：
+1. 用 BIOS 健康页或硬件监控工具查看 CPU 温度
+2. 若满载超过 90°C，清理风扇与散热器灰尘，必要时更换硅脂
+
+**预期结果**：满载温度降至合理范围
+
+### 第二步：关闭超频
+**目的**：排除不稳定的超频设置
+**具体操作**：
+1. 重启进入 BIOS（开机按 Del/F2）
+2. 载入默认设置（Load Optimized Defaults），关闭 XMP/手动超频
+3. 保存并重启
+
+**预期结果**：系统以默认频率运行
+
+### 第三步：运行内存诊断
+**目的**：排除内存故障
+**命令行方式**（如适用）：
+```
+mdsched.exe
+```
+
+**预期结果**：诊断无错误
+
+## 四、验证修复
+
+1. **检查方法**：高负载（压力测试/游戏）运行观察
+2. **观察时间**：3 天
+3. **成功标志**：无新的 0x7F 蓝屏
+
+## 五、如果问题仍未解决
+1. 更新 BIOS/UEFI 到最新版本
+2. 更换/排查电源
+3. 联系硬件售后检测 CPU 与主板""",
+    0x124: """## 一、根因分析
+WHEA 报告了不可纠正的硬件错误（崩溃地址 {crash_address}），通常指向 CPU、供电或主板问题。
+
+## 二、技术解释
+WHEA_UNCORRECTABLE_ERROR：硬件错误架构捕获到机器检查异常（MCE），属于硬件层故障信号。
+
+## 三、具体修复步骤（按优先级排序）
+
+### 第一步：检查温度并关闭超频
+**目的**：排除过热与不稳定超频
+**具体操作**：
+1. 进入 BIOS 载入默认设置，关闭 XMP/超频
+2. 查看 CPU 温度，必要时清灰、换硅脂
+
+**预期结果**：默认频率下温度正常
+
+### 第二步：更新 BIOS
+**目的**：修复微码与兼容性问题
+**具体操作**：
+1. 到主板厂商官网下载对应型号最新 BIOS
+2. 按官方说明刷写并重启
+
+**预期结果**：BIOS 为最新版本
+
+### 第三步：排查电源
+**目的**：排除供电不稳
+**具体操作**：
+1. 如有条件更换一个额定功率足够的电源测试
+2. 观察蓝屏是否消失
+
+**预期结果**：供电稳定无蓝屏
+
+## 四、验证修复
+
+1. **检查方法**：压力测试（CPU 满载）下观察
+2. **观察时间**：3-7 天
+3. **成功标志**：无新的 0x124 蓝屏
+
+## 五、如果问题仍未解决
+1. 事件查看器查看 WHEA-Logger 条目定位具体部件
+2. 逐件替换法排查 CPU/主板/内存
+3. 联系硬件厂商售后检测""",
+    0x133: """## 一、根因分析
+DPC 看门狗检测到长时间运行（崩溃地址 {crash_address}），常见原因是 SSD 固件或存储驱动问题。
+
+## 二、技术解释
+DPC_WATCHDOG_VIOLATION：DPC 在 DISPATCH_LEVEL 运行超时，多由存储栈（SSD 固件/驱动）卡住导致。
+
+## 三、具体修复步骤（按优先级排序）
+
+### 第一步：更新 SSD 固件
+**目的**：修复固件缺陷
+**具体操作**：
+1. 到 SSD 厂商官网下载官方工具箱（如 Samsung Magician）
+2. 检查并更新固件，重启
+
+**预期结果**：固件为最新版本
+
+### 第二步：更新存储控制器驱动
+**目的**：替换缺陷的 AHCI/NVMe 驱动
+**具体操作**：
+1. 按 Win+X → 设备管理器 → IDE ATA/ATAPI 控制器 或 存储控制器
+2. 右键控制器 → 更新驱动程序
+
+**预期结果**：存储驱动为最新
+
+### 第三步：修复系统文件
+**目的**：排除系统组件损坏
+**命令行方式**（如适用）：
+```
+sfc /scannow
+```
+
+**预期结果**：提示已修复或无冲突
+
+## 四、验证修复
+
+1. **检查方法**：大量磁盘读写场景下观察
+2. **观察时间**：3-7 天
+3. **成功标志**：无新的 0x133 蓝屏
+
+## 五、如果问题仍未解决
+1. 干净启动排查第三方过滤驱动（杀软/虚拟光驱）
+2. 更换 SATA 线/接口或 NVMe 插槽
+3. 检查磁盘健康（S.M.A.R.T.）""",
+    0xEF: """## 一、根因分析
+关键系统进程意外终止（崩溃地址 {crash_address}），通常由系统文件损坏或磁盘错误导致。
+
+## 二、技术解释
+CRITICAL_PROCESS_DIED：csrss/wininit 等关键进程退出，内核强制停机保护系统。
+
+## 三、具体修复步骤（按优先级排序）
+
+### 第一步：修复系统文件
+**目的**：修复损坏的系统组件
+**命令行方式**（如适用）：
+```
+sfc /scannow
+DISM /Online /Cleanup-Image /RestoreHealth
+```
+
+**预期结果**：提示已修复或无冲突
+
+### 第二步：检查磁盘
+**目的**：排除磁盘损坏
+**命令行方式**（如适用）：
+```
+chkdsk C: /f /r
+```
+
+**预期结果**：重启后检查完成且无坏道
+
+### 第三步：全盘杀毒
+**目的**：排除恶意软件终止系统进程
+**具体操作**：
+1. 打开"Windows 安全中心 → 病毒和威胁防护"
+2. 选择"扫描选项 → 完全扫描"并开始扫描
+
+**预期结果**：未发现威胁或已清除
+
+## 四、验证修复
+
+1. **检查方法**：事件查看器筛选 BugCheck 与应用程序错误事件
+2. **观察时间**：3-7 天
+3. **成功标志**：无新的 0xEF 蓝屏
+
+## 五、如果问题仍未解决
+1. 卸载最近一次 Windows 更新观察
+2. 执行系统还原到稳定时间点
+3. 保留数据重置系统（设置 → 恢复）""",
+}
+
+
+def get_playbook(code: int, crash_address: int = 0) -> Optional[str]:
+    """Return the canned report for a bugcheck code, if one exists.
+
+    Args:
+        code: Bugcheck code
+        crash_address: Crash address substituted into the report
+
+    Returns:
+        Formatted Markdown report, or None for unknown codes
+    """
+    playbook = KNOWN_BUGCHECK_PLAYBOOKS.get(code)
+    if playbook is None:
+        return None
+    return playbook.format(crash_address=f"0x{crash_address:X}")
+
+
+def stack_top_is_stock(stack_traces: List) -> bool:
+    """Check whether the crash stack tops out in a stock OS module.
+
+    An empty stack counts as stock: with no frames there is no
+    third-party driver evidence either.
+
+    Args:
+        stack_traces: Stack traces from the dump
+
+    Returns:
+        True if no third-party module sits at the top of the stack
+    """
+    for trace in stack_traces:
+        if trace.frames:
+            return trace.frames[0].module_name.lower() in STOCK_OS_MODULES
+    return True
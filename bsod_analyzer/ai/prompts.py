@@ -2,47 +2,14 @@
 AI prompt templates for crash analysis.
 """
 
-from typing import Dict, Any, List
+from typing import Dict, Any, Final, List
 
 
-class PromptTemplates:
-    """Templates for AI prompts."""
-
-    def generate_analysis_prompt(self, context: Dict[str, Any]) -> str:
-        """Generate prompt for single crash analysis.
-
-        Args:
-            context: Dictionary containing crash information
-
-        Returns:
-            Formatted prompt string
-        """
-        return f"""你是一位Windows崩溃转储分析专家。请分析以下蓝屏(BSOD)崩溃信息，并提供详细的分析报告。
-
-## 崩溃信息
-- Bugcheck代码: {context['bugcheck_code']}
-- Bugcheck名称: {context['bugcheck_name']}
-- 描述: {context['bugcheck_description']}
-- 崩溃地址: {context['crash_address']}
-- 参数: {context['crash_parameters']}
-
-## 疑似驱动
-{context['suspected_driver']}
-
-## 系统信息
-- 计算机名: {context['computer_name']}
-- 操作系统: {context['os_version']}
-- CPU架构: {context['cpu_architecture']}
-- 内存: {context['physical_memory']} MB
-- 处理器数量: {context['number_of_processors']}
-
-## 已加载驱动 (共{context['driver_count']}个)
-{context['driver_list']}
-
-## 堆栈跟踪
-{context['stack_traces']}
-
----
+# Static analysis instructions, kept as one constant prefix so the
+# provider sees an identical system message for every crash. Providers
+# only cache exact prefix matches, so all variable crash data must stay
+# out of this block and go into the per-request user payload instead.
+ANALYSIS_SYSTEM_PREFIX: Final[str] = """你是一位Windows崩溃转储分析专家。请分析用户提供的蓝屏(BSOD)崩溃信息，并提供详细的分析报告。
 
 请严格按照以下格式，用中文提供分析报告：
 
@@ -94,26 +61,13 @@ class PromptTemplates:
 4. 步骤必须可执行，避免"更新驱动"、"检查系统"等模糊表述
 5. 对于涉及注册表的操作，必须提供完整的注册表路径和键值
 6. 对于涉及命令行的操作，必须提供完整的命令
-7. 所有步骤按优先级排序，从最可能有效的方案开始"""
+7. 所有步骤按优先级排序，从最可能有效的方案开始
+8. 保持简洁：每节内容不超过80字，修复步骤不超过3步，避免重复说明"""
 
-    def generate_history_analysis_prompt(self, crashes: List[Dict[str, Any]]) -> str:
-        """Generate prompt for crash history pattern analysis.
 
-        Args:
-            crashes: List of crash records
-
-        Returns:
-            Formatted prompt string
-        """
-        crash_summaries = "\n".join([
-            f"- {c['timestamp']}: 0x{c['bugcheck_code']:02X} ({c['bugcheck_name']}) - 驱动: {c['suspected_driver']}"
-            for c in crashes
-        ])
-
-        return f"""你是一位Windows蓝屏分析专家。系统在过去一段时间内经历了{len(crashes)}次蓝屏崩溃。
-
-## 崩溃历史
-{crash_summaries}
+#: Static tail of the crash-history prompt; interned once so the hot
+#: path only formats the per-request crash summaries.
+HISTORY_ANALYSIS_SUFFIX: Final[str] = """
 
 请用中文分析并提供以下内容：
 
@@ -149,27 +103,9 @@ class PromptTemplates:
 2. 提供具体的操作步骤，包含路径、命令、参数
 3. 按优先级排序方案"""
 
-    def generate_driver_analysis_prompt(self, driver_name: str, crash_context: Dict[str, Any]) -> str:
-        """Generate prompt for specific driver analysis.
-
-        Args:
-            driver_name: Name of the driver
-            crash_context: Context of the crash
-
-        Returns:
-            Formatted prompt string
-        """
-        return f"""请分析以下驱动程序在Windows蓝屏崩溃中的作用。
-
-## 驱动信息
-- 驱动名称: {driver_name}
-- 基地址: 0x{crash_context.get('base_address', 0):X}
-- 大小: {crash_context.get('size', 0):,} 字节
-
-## 崩溃上下文
-- Bugcheck代码: {crash_context.get('bugcheck_code', 'Unknown')}
-- 崩溃地址: 0x{crash_context.get('crash_address', 0):X}
 
+#: Static tail of the per-driver prompt, shared across all driver calls.
+DRIVER_ANALYSIS_SUFFIX: Final[str] = """
 ---
 
 请用中文提供以下分析：
@@ -213,6 +149,134 @@ class PromptTemplates:
 2. 提供完整的操作步骤，包括具体的菜单路径和按钮名称
 3. 提供命令行方式（如适用）"""
 
+
+class PromptTemplates:
+    """Templates for AI prompts."""
+
+    #: Static instruction prefix to send as the system message alongside
+    #: the variable payload returned by `generate_analysis_prompt`.
+    analysis_system_prompt: Final[str] = ANALYSIS_SYSTEM_PREFIX
+
+    def generate_analysis_prompt(self, context: Dict[str, Any]) -> str:
+        """Generate the variable payload for single crash analysis.
+
+        The static instructions live in `analysis_system_prompt`; this
+        method only emits the per-crash data, keeping the cacheable
+        prefix identical across requests.
+
+        Args:
+            context: Dictionary containing crash information
+
+        Returns:
+            Formatted prompt string
+        """
+        return f"""## 崩溃信息
+- Bugcheck代码: {context['bugcheck_code']}
+- Bugcheck名称: {context['bugcheck_name']}
+- 描述: {context['bugcheck_description']}
+- 崩溃地址: {context['crash_address']}
+- 参数: {context['crash_parameters']}
+
+## 疑似驱动
+{context['suspected_driver']}
+
+## 系统信息
+- 计算机名: {context['computer_name']}
+- 操作系统: {context['os_version']}
+- CPU架构: {context['cpu_architecture']}
+- 内存: {context['physical_memory']} MB
+- 处理器数量: {context['number_of_processors']}
+
+## 已加载驱动 (共{context['driver_count']}个)
+{context['driver_list']}
+
+## 堆栈跟踪
+{context['stack_traces']}"""
+
+    def generate_history_analysis_prompt(self, crashes: List[Dict[str, Any]]) -> str:
+        """Generate prompt for crash history pattern analysis.
+
+        Args:
+            crashes: List of crash records
+
+        Returns:
+            Formatted prompt string
+        """
+        crash_summaries = "\n".join([
+            f"- {c['timestamp']}: 0x{c['bugcheck_code']:02X} ({c['bugcheck_name']}) - 驱动: {c['suspected_driver']}"
+            for c in crashes
+        ])
+
+        return "".join((
+            f"你是一位Windows蓝屏分析专家。系统在过去一段时间内经历了{len(crashes)}次蓝屏崩溃。\n\n## 崩溃历史\n",
+            crash_summaries,
+            HISTORY_ANALYSIS_SUFFIX,
+        ))
+
+    def generate_driver_analysis_prompt(self, driver_name: str, crash_context: Dict[str, Any]) -> str:
+        """Generate prompt for specific driver analysis.
+
+        Args:
+            driver_name: Name of the driver
+            crash_context: Context of the crash
+
+        Returns:
+            Formatted prompt string
+        """
+        return "".join((
+            f"""请分析以下驱动程序在Windows蓝屏崩溃中的作用。
+
+## 驱动信息
+- 驱动名称: {driver_name}
+- 基地址: 0x{crash_context.get('base_address', 0):X}
+- 大小: {crash_context.get('size', 0):,} 字节
+
+## 崩溃上下文
+- Bugcheck代码: {crash_context.get('bugcheck_code', 'Unknown')}
+- 崩溃地址: 0x{crash_context.get('crash_address', 0):X}
+""",
+            DRIVER_ANALYSIS_SUFFIX,
+        ))
+
+    def generate_batched_driver_analysis_prompt(
+        self, driver_names: List[str], crash_context: Dict[str, Any]
+    ) -> str:
+        """Generate one prompt covering several drivers.
+
+        The shared crash context appears once, so a single round trip
+        replaces N per-driver requests and N copies of the context.
+
+        Args:
+            driver_names: Names of the drivers to analyze
+            crash_context: Context of the crash, shared by all drivers
+
+        Returns:
+            Formatted prompt string
+        """
+        driver_list = "\n".join(f"- {name}" for name in driver_names)
+
+        return f"""请分析以下驱动程序在Windows蓝屏崩溃中的作用。
+
+## 崩溃上下文
+- Bugcheck代码: {crash_context.get('bugcheck_code', 'Unknown')}
+- 崩溃地址: 0x{crash_context.get('crash_address', 0):X}
+
+## 待分析驱动列表
+{driver_list}
+
+---
+
+请对每个驱动分别分析，并以JSON数组返回，每个元素格式如下：
+
+```json
+{{"driver": "驱动文件名", "role": "驱动作用", "issues": "可能导致蓝屏的常见原因", "fix": "具体修复方法"}}
+```
+
+**要求**：
+1. 必须使用中文
+2. 数组顺序与驱动列表一致
+3. 只返回JSON数组，不要附加其他文字"""
+
     def format_driver_list(self, drivers: List[Any], max_drivers: int = 20) -> str:
         """Format driver list for prompt.
 
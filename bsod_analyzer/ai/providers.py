@@ -4,8 +4,17 @@ AI provider implementations.
 Supports ZhipuAI (GLM-4.7) for crash analysis.
 """
 
+import asyncio
+import hashlib
+import json
+import random
+import re
+import sqlite3
+import threading
+import time
 from abc import ABC, abstractmethod
-from typing import Optional
+from pathlib import Path
+from typing import Iterator, Optional
 from loguru import logger
 
 
@@ -13,17 +22,67 @@ class IAIProvider(ABC):
     """AI provider interface."""
 
     @abstractmethod
-    def analyze(self, prompt: str) -> str:
+    def analyze(
+        self,
+        prompt: str,
+        system: Optional[str] = None,
+        max_tokens: Optional[int] = None,
+    ) -> str:
         """Send analysis request to AI.
 
         Args:
-            prompt: The prompt to send
+            prompt: The user prompt to send
+            system: Optional system message overriding the provider default
+            max_tokens: Optional completion-length cap overriding the default
 
         Returns:
             AI response text
         """
         pass
 
+    async def analyze_async(
+        self,
+        prompt: str,
+        system: Optional[str] = None,
+        max_tokens: Optional[int] = None,
+    ) -> str:
+        """Send analysis request to AI without blocking the event loop.
+
+        The default implementation runs the synchronous ``analyze`` in a
+        worker thread, so multiple requests can be awaited concurrently
+        via ``asyncio.gather``. Providers with a native async client may
+        override this.
+
+        Args:
+            prompt: The prompt to send
+
+        Returns:
+            AI response text
+        """
+        return await asyncio.to_thread(self.analyze, prompt, system, max_tokens)
+
+    def analyze_stream(
+        self,
+        prompt: str,
+        system: Optional[str] = None,
+        max_tokens: Optional[int] = None,
+    ) -> Iterator[str]:
+        """Send analysis request to AI, yielding response text as it arrives.
+
+        The default implementation yields the full blocking response in
+        one chunk; streaming providers override this to surface tokens
+        as soon as they are generated.
+
+        Args:
+            prompt: The user prompt to send
+            system: Optional system message overriding the provider default
+            max_tokens: Optional completion-length cap overriding the default
+
+        Yields:
+            Chunks of AI response text
+        """
+        yield self.analyze(prompt, system, max_tokens)
+
     @abstractmethod
     def is_available(self) -> bool:
         """Check if the provider is properly configured."""
@@ -33,6 +92,20 @@ class IAIProvider(ABC):
 class ZhipuProvider(IAIProvider):
     """ZhipuAI provider for GLM-4.7."""
 
+    DEFAULT_SYSTEM_PROMPT = (
+        "你是一位 Windows 崩溃转储分析专家。请用中文提供清晰的技术解释和具体的可操作建议。"
+    )
+
+    #: Retry policy for transient upstream errors (429 / 5xx / timeouts)
+    MAX_ATTEMPTS = 4
+    BACKOFF_BASE = 0.5
+    BACKOFF_MAX = 8.0
+
+    #: Circuit breaker: after this many consecutive failures, report
+    #: unavailable for COOLDOWN_SECONDS so bulk callers fail fast.
+    FAILURE_THRESHOLD = 5
+    COOLDOWN_SECONDS = 60.0
+
     def __init__(self, api_key: str, model: str = "glm-4.7"):
         """Initialize ZhipuAI provider.
 
@@ -43,45 +116,141 @@ class ZhipuProvider(IAIProvider):
         self.api_key = api_key
         self.model = model
         self._client = None
+        self._consecutive_failures = 0
+        self._circuit_open_until = 0.0
 
     def _get_client(self):
-        """Lazy load the ZhipuAI client."""
+        """Lazy load the ZhipuAI client.
+
+        A pooled httpx client with keep-alive is passed in when httpx is
+        available, so back-to-back requests reuse the TCP+TLS connection
+        instead of re-handshaking per call.
+        """
         if self._client is None:
             try:
                 from zhipuai import ZhipuAI
-                self._client = ZhipuAI(api_key=self.api_key)
-                logger.debug(f"ZhipuAI client initialized with model: {self.model}")
             except ImportError:
                 raise RuntimeError(
                     "zhipuai package not found. Install with: pip install zhipuai"
                 )
+
+            client_kwargs = {"api_key": self.api_key}
+            try:
+                import httpx
+
+                client_kwargs["http_client"] = httpx.Client(
+                    limits=httpx.Limits(
+                        max_keepalive_connections=20,
+                        max_connections=100,
+                        keepalive_expiry=30.0,
+                    ),
+                )
+            except ImportError:
+                logger.debug("httpx not available, using SDK default HTTP client")
+
+            self._client = ZhipuAI(**client_kwargs)
+            logger.debug(f"ZhipuAI client initialized with model: {self.model}")
         return self._client
 
-    def analyze(self, prompt: str) -> str:
+    @staticmethod
+    def _is_transient(error: Exception) -> bool:
+        """Check whether an upstream error is worth retrying.
+
+        Matched by status code (429 / 5xx) or SDK exception class name,
+        so the zhipuai package does not have to be imported eagerly.
+        """
+        status = getattr(error, "status_code", None)
+        if status in (429, 500, 502, 503, 504):
+            return True
+        return type(error).__name__ in (
+            "RateLimitError",
+            "APIConnectionError",
+            "APITimeoutError",
+        )
+
+    def _create_with_retry(self, **kwargs):
+        """Call ``chat.completions.create`` with backoff on transient errors.
+
+        Retries up to MAX_ATTEMPTS times with randomized exponential
+        backoff, so a transient 429/5xx does not discard the whole
+        analysis (or the provider-side prompt-cache warmth). Permanent
+        errors are re-raised immediately. A circuit breaker trips after
+        FAILURE_THRESHOLD consecutive failures so bulk analysis fails
+        fast instead of hammering a down upstream.
+        """
+        remaining = self._circuit_open_until - time.time()
+        if remaining > 0:
+            raise RuntimeError(
+                f"ZhipuAI circuit breaker open, retry in {remaining:.0f}s"
+            )
+
+        client = self._get_client()
+
+        last_error: Optional[Exception] = None
+        for attempt in range(self.MAX_ATTEMPTS):
+            try:
+                response = client.chat.completions.create(**kwargs)
+                self._consecutive_failures = 0
+                return response
+            except Exception as e:
+                if not self._is_transient(e):
+                    self._record_failure()
+                    raise
+                last_error = e
+                if attempt < self.MAX_ATTEMPTS - 1:
+                    delay = random.uniform(
+                        0, min(self.BACKOFF_MAX, self.BACKOFF_BASE * 2**attempt)
+                    )
+                    logger.warning(
+                        f"Transient ZhipuAI error ({e}), "
+                        f"retrying in {delay:.1f}s "
+                        f"(attempt {attempt + 1}/{self.MAX_ATTEMPTS})"
+                    )
+                    time.sleep(delay)
+
+        self._record_failure()
+        raise last_error
+
+    def _record_failure(self) -> None:
+        """Count a failed request and trip the circuit breaker if needed."""
+        self._consecutive_failures += 1
+        if self._consecutive_failures >= self.FAILURE_THRESHOLD:
+            self._circuit_open_until = time.time() + self.COOLDOWN_SECONDS
+            logger.warning(
+                f"ZhipuAI circuit breaker open for {self.COOLDOWN_SECONDS:.0f}s "
+                f"after {self._consecutive_failures} consecutive failures"
+            )
+
+    def analyze(
+        self,
+        prompt: str,
+        system: Optional[str] = None,
+        max_tokens: Optional[int] = None,
+    ) -> str:
         """Send analysis request to ZhipuAI.
 
+        The system message carries the static (cacheable) instruction
+        prefix; the user message carries only the variable crash data.
+
         Args:
-            prompt: The prompt to send
+            prompt: The user prompt to send
+            system: Optional system message overriding the default
+            max_tokens: Optional completion-length cap (default: 8192)
 
         Returns:
             AI response text
         """
         try:
-            client = self._get_client()
-
             logger.debug(f"Sending request to ZhipuAI (model: {self.model})...")
 
-            response = client.chat.completions.create(
+            response = self._create_with_retry(
                 model=self.model,
                 messages=[
-                    {
-                        "role": "system",
-                        "content": "你是一位 Windows 崩溃转储分析专家。请用中文提供清晰的技术解释和具体的可操作建议。",
-                    },
+                    {"role": "system", "content": system or self.DEFAULT_SYSTEM_PROMPT},
                     {"role": "user", "content": prompt},
                 ],
                 temperature=0.3,
-                max_tokens=8192,
+                max_tokens=max_tokens or 8192,
             )
 
             result = response.choices[0].message.content
@@ -92,11 +261,214 @@ class ZhipuProvider(IAIProvider):
             logger.error(f"ZhipuAI request failed: {e}")
             raise RuntimeError(f"AI analysis failed: {e}")
 
+    def analyze_stream(
+        self,
+        prompt: str,
+        system: Optional[str] = None,
+        max_tokens: Optional[int] = None,
+    ) -> Iterator[str]:
+        """Send analysis request to ZhipuAI, yielding tokens as they arrive.
+
+        Lowers perceived latency from full-completion time to
+        time-to-first-token; callers print chunks as they come in.
+
+        Args:
+            prompt: The user prompt to send
+            system: Optional system message overriding the default
+            max_tokens: Optional completion-length cap (default: 8192)
+
+        Yields:
+            Response text chunks
+        """
+        try:
+            logger.debug(f"Sending streaming request to ZhipuAI (model: {self.model})...")
+
+            response = self._create_with_retry(
+                model=self.model,
+                messages=[
+                    {"role": "system", "content": system or self.DEFAULT_SYSTEM_PROMPT},
+                    {"role": "user", "content": prompt},
+                ],
+                temperature=0.3,
+                max_tokens=max_tokens or 8192,
+                stream=True,
+            )
+
+            for chunk in response:
+                delta = chunk.choices[0].delta.content
+                if delta:
+                    yield delta
+
+            logger.debug("Streaming response from ZhipuAI complete")
+
+        except Exception as e:
+            logger.error(f"ZhipuAI streaming request failed: {e}")
+            raise RuntimeError(f"AI analysis failed: {e}")
+
     def is_available(self) -> bool:
-        """Check if ZhipuAI is properly configured."""
+        """Check if ZhipuAI is properly configured and not circuit-broken."""
+        if time.time() < self._circuit_open_until:
+            return False
         return bool(self.api_key)
 
 
+class CachingProvider(IAIProvider):
+    """Disk-backed exact-match response cache around another provider.
+
+    Responses are keyed by a SHA-256 hash of the model, prompt, and
+    sampling parameters, so a repeat crash (same bugcheck + driver set)
+    returns instantly at zero token cost.
+    """
+
+    def __init__(
+        self,
+        inner: IAIProvider,
+        cache_dir: Optional[Path] = None,
+        ttl_seconds: int = 86400,
+    ):
+        """Initialize the caching provider.
+
+        Args:
+            inner: The provider to wrap
+            cache_dir: Cache directory (default: ~/.cache/bsod_analyzer/llm)
+            ttl_seconds: How long cached responses stay valid (default: 24h)
+        """
+        self.inner = inner
+        self.ttl_seconds = ttl_seconds
+
+        if cache_dir is None:
+            cache_dir = Path.home() / ".cache" / "bsod_analyzer" / "llm"
+        cache_dir.mkdir(parents=True, exist_ok=True)
+
+        # analyze_async runs analyze in worker threads (asyncio.to_thread),
+        # so the connection must be shareable; the lock serializes access
+        # since concurrent gather calls would otherwise race on it
+        self._conn = sqlite3.connect(
+            cache_dir / "responses.db", check_same_thread=False
+        )
+        self._lock = threading.Lock()
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                response TEXT NOT NULL,
+                created_at REAL NOT NULL
+            )
+        """)
+        self._conn.commit()
+
+    def _cache_key(self, prompt: str, system: Optional[str]) -> str:
+        """Build a stable cache key for a prompt."""
+        payload = json.dumps(
+            {"m": getattr(self.inner, "model", ""), "sys": system or "", "u": prompt, "t": 0.3},
+            ensure_ascii=False,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def analyze(
+        self,
+        prompt: str,
+        system: Optional[str] = None,
+        max_tokens: Optional[int] = None,
+    ) -> str:
+        """Return a cached response when available, else ask the inner provider."""
+        key = self._cache_key(prompt, system)
+
+        cached = self._lookup(key)
+        if cached is not None:
+            return cached
+
+        result = self.inner.analyze(prompt, system, max_tokens)
+        self._store(key, result)
+        return result
+
+    def analyze_stream(
+        self,
+        prompt: str,
+        system: Optional[str] = None,
+        max_tokens: Optional[int] = None,
+    ) -> Iterator[str]:
+        """Stream a cached response, or stream from the inner provider.
+
+        A cache hit is yielded as a single chunk; on a miss the inner
+        provider's stream is passed through and the accumulated text is
+        cached, so a later analyze() of the same crash also hits.
+        """
+        key = self._cache_key(prompt, system)
+
+        cached = self._lookup(key)
+        if cached is not None:
+            yield cached
+            return
+
+        chunks = []
+        for chunk in self.inner.analyze_stream(prompt, system, max_tokens):
+            chunks.append(chunk)
+            yield chunk
+        self._store(key, "".join(chunks))
+
+    def _lookup(self, key: str) -> Optional[str]:
+        """Return the cached response for a key, or None on miss/expiry."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response, created_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+        if row and time.time() - row[1] < self.ttl_seconds:
+            logger.debug("LLM response cache hit")
+            return row[0]
+        return None
+
+    def _store(self, key: str, response: str) -> None:
+        """Persist a response under a key."""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, response, created_at) VALUES (?, ?, ?)",
+                (key, response, time.time()),
+            )
+            self._conn.commit()
+
+    def is_available(self) -> bool:
+        """Check if the wrapped provider is properly configured."""
+        return self.inner.is_available()
+
+
+#: Volatile tokens that differ between otherwise-identical crashes:
+#: hex addresses/offsets, decimal sizes, and timestamps.
+_VOLATILE_TOKENS = re.compile(
+    r"0x[0-9A-Fa-f]+"
+    r"|\b\d{4}-\d{2}-\d{2}[ T]\d{2}:\d{2}(?::\d{2})?\b"
+    r"|\b\d[\d,]*\b"
+)
+
+
+class SemanticCachingProvider(CachingProvider):
+    """Cache that also hits on semantically equivalent crash prompts.
+
+    Two dumps of the same crash are rarely byte-identical — load
+    addresses, sizes, and timestamps differ — so the exact-match cache
+    misses. This variant canonicalizes the prompt before hashing by
+    stripping those volatile tokens, so prompts with the same bugcheck,
+    driver set, and stack shape collide on one cache entry.
+    """
+
+    @staticmethod
+    def canonicalize(prompt: str) -> str:
+        """Strip volatile hex addresses, sizes, and timestamps from a prompt.
+
+        Bugcheck lines are left untouched: the code is a hex literal
+        and an unrecognized code renders as an UNKNOWN_0x... name, so
+        blanket substitution would collapse different crashes onto one
+        cache entry.
+        """
+        return "\n".join(
+            line if "Bugcheck" in line else _VOLATILE_TOKENS.sub("*", line)
+            for line in prompt.split("\n")
+        )
+
+    def _cache_key(self, prompt: str, system: Optional[str]) -> str:
+        """Build a cache key from the canonicalized prompt."""
+        return super()._cache_key(self.canonicalize(prompt), system)
+
+
 class AIProviderFactory:
     """Factory for creating AI providers."""
 
@@ -135,4 +507,12 @@ class AIProviderFactory:
             logger.warning("ZHIPU_API_KEY not configured")
             return None
 
-        return ZhipuProvider(api_key=api_key, model=config.ai_model)
+        provider = ZhipuProvider(api_key=api_key, model=config.ai_model)
+
+        if getattr(config, "ai_cache_enabled", True):
+            if getattr(config, "ai_semantic_cache", False):
+                provider = SemanticCachingProvider(provider, ttl_seconds=config.ai_cache_ttl)
+            else:
+                provider = CachingProvider(provider, ttl_seconds=config.ai_cache_ttl)
+
+        return provider
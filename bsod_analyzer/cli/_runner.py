@@ -0,0 +1,137 @@
+"""
+Shared single-dump analysis pipeline for CLI commands.
+
+analyze 和 scan --analyze 共用同一套 "解析 + 组件初始化 +
+可选AI + 进度展示" 流程；集中在这里维护，缓存、懒导入、
+路径特化等优化只需要改一处。
+"""
+
+import functools
+from typing import Optional
+
+from bsod_analyzer.utils.config import get_config
+
+
+@functools.lru_cache(maxsize=1)
+def _get_components() -> tuple:
+    """获取进程内共享的知识库和驱动检测器实例。
+
+    两者构造时都要加载数据表，批量分析时按进程只构造一次。
+
+    Returns:
+        (BugcheckKnowledgeBase, DriverDetector) 元组
+    """
+    from bsod_analyzer.core.bugcheck_kb import BugcheckKnowledgeBase
+    from bsod_analyzer.core.driver_detector import DriverDetector
+
+    return BugcheckKnowledgeBase(), DriverDetector()
+
+
+@functools.lru_cache(maxsize=1)
+def _get_ai_analyzer() -> Optional["AIAnalyzer"]:
+    """获取进程内共享的AI分析器实例。
+
+    Provider 构造会建立HTTP连接池，缓存后同一进程内多个命令
+    （或批量分析）只初始化一次。配置本身已由 get_config() 缓存。
+
+    Returns:
+        AIAnalyzer 实例；未配置 ZHIPU_API_KEY 时返回 None
+    """
+    from bsod_analyzer.ai.analyzer import AIAnalyzer
+    from bsod_analyzer.ai.providers import AIProviderFactory
+
+    config = get_config()
+    if not config.zhipu_api_key:
+        return None
+    return AIAnalyzer(provider=AIProviderFactory.create_from_config(config))
+
+
+def _run_no_ai(analyzer, dump_path: str, progress, task):
+    """无AI路径：只做本地分析，完全不触碰AI栈。"""
+    return analyzer.analyze(dump_path)
+
+
+def _run_with_ai(analyzer, dump_path: str, progress, task, ai_analyzer):
+    """AI路径：本地分析后追加AI解读（流式接收）。
+
+    逐块消费 analyze_stream：进度条实时显示已接收字数，
+    不在 live 区域内直接打印原文——完整的AI面板随后由
+    display_analysis_result_rich 统一渲染，避免重复输出。
+    """
+    result = analyzer.analyze(dump_path)
+    progress.update(task, description="AI分析中...")
+    chunks = []
+    received = 0
+    for chunk in ai_analyzer.analyze_stream(
+        crash_info=result.crash_info,
+        drivers=result.loaded_drivers,
+        stack_traces=result.stack_traces,
+        minidump_info=result.minidump_info,
+        suspected_driver=result.suspected_driver,
+    ):
+        chunks.append(chunk)
+        received += len(chunk)
+        progress.update(task, description=f"AI分析中... 已接收 {received} 字")
+    result.ai_analysis = "".join(chunks)
+    return result
+
+
+def _select_run(ai_analyzer):
+    """按AI开关选定执行路径，省掉热路径里的重复判断。"""
+    if ai_analyzer is not None and ai_analyzer.enabled:
+        return functools.partial(_run_with_ai, ai_analyzer=ai_analyzer)
+    return _run_no_ai
+
+
+def run_single_dump(dump_file: str, *, ai: bool, save: bool, console):
+    """完整分析一个dump文件：解析、本地分析、可选AI、可选入库。
+
+    Args:
+        dump_file: dump文件路径
+        ai: 是否启用AI分析
+        save: 是否保存结果到数据库
+        console: 用于进度和提示输出的 rich Console
+
+    Returns:
+        AnalysisResult 分析结果
+    """
+    from rich.progress import Progress, SpinnerColumn, TextColumn
+
+    from bsod_analyzer.core.parser import create_parser
+    from bsod_analyzer.core.analyzer import BSODAnalyzer
+
+    # Initialize parser - auto-detect format (Minidump or PAGEDU64)
+    with console.status("[bold green]解析dump文件...", spinner="dots"):
+        parser = create_parser(dump_file)
+
+    # Initialize components
+    kb, driver_detector = _get_components()
+    ai_analyzer = None
+
+    # Initialize AI if requested
+    if ai:
+        with console.status("[bold blue]初始化AI分析器...", spinner="dots"):
+            ai_analyzer = _get_ai_analyzer()
+        if ai_analyzer is None:
+            console.print("[yellow]警告: ZHIPU_API_KEY未配置，AI分析已禁用[/yellow]")
+
+    # Run analysis（按AI开关提前选定路径）
+    _run = _select_run(ai_analyzer)
+    with Progress(
+        SpinnerColumn(),
+        TextColumn("[progress.description]{task.description}"),
+        console=console,
+    ) as progress:
+        task = progress.add_task("分析崩溃中...", total=None)
+        analyzer = BSODAnalyzer(parser, kb, driver_detector)
+        result = _run(analyzer, dump_file, progress, task)
+
+    # Save to database
+    if save:
+        from bsod_analyzer.database.manager import DatabaseManager
+
+        db = DatabaseManager()
+        db.save_analysis(result)
+        console.print("\n[green]✓[/green] 分析结果已保存到数据库")
+
+    return result
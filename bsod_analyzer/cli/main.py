@@ -14,31 +14,34 @@ if sys.platform == "win32":
     sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8', errors='replace')
 
 import click
+import functools
+import heapq
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, replace
 from pathlib import Path
-from typing import Optional, List
+from typing import Iterator, Optional, List
 from datetime import datetime
 from rich.console import Console
-from rich.progress import Progress, SpinnerColumn, TextColumn
-from rich.table import Table
-from rich.panel import Panel
-
-from bsod_analyzer.core.parser import create_parser
-from bsod_analyzer.core.analyzer import BSODAnalyzer
-from bsod_analyzer.core.bugcheck_kb import BugcheckKnowledgeBase
-from bsod_analyzer.core.driver_detector import DriverDetector
-from bsod_analyzer.ai.analyzer import AIAnalyzer
-from bsod_analyzer.ai.providers import AIProviderFactory
-from bsod_analyzer.database.manager import DatabaseManager
+
 from bsod_analyzer.utils.config import get_config
-from bsod_analyzer.utils.formatters import (
-    display_analysis_result_rich,
-    display_crash_history,
-    display_statistics,
-    save_result_to_file,
-    format_text_output,
-)
 
-console = Console()
+# 重量级模块（rich 渲染组件、解析器、AI栈、数据库、格式化工具）
+# 都推迟到实际使用它们的子命令内部导入，让 bsod --version /
+# bsod config 这类轻量调用不用付整个依赖树的导入成本。
+
+def _make_console() -> Console:
+    """按输出目标构建控制台。
+
+    输出被管道/重定向时关闭语法高亮和emoji处理，省掉逐行的
+    正则高亮开销；markup 保持开启——rich 解析后会剥掉样式
+    标签，关闭它反而会把字面 [green] 标签写进日志。
+    """
+    if sys.stdout.isatty():
+        return Console()
+    return Console(highlight=False, emoji=False)
+
+
+console = _make_console()
 
 
 @click.group()
@@ -70,46 +73,14 @@ def analyze(dump_file: str, output: Optional[str], format: str, ai: bool, save:
         bsod analyze dump.dmp --ai --save
         bsod analyze dump.dmp -o report.json -f json
     """
+    from bsod_analyzer.cli._runner import run_single_dump
+    from bsod_analyzer.utils.formatters import (
+        display_analysis_result_rich,
+        save_result_to_file,
+    )
+
     try:
-        # Initialize parser - auto-detect format (Minidump or PAGEDU64)
-        with console.status("[bold green]解析dump文件...", spinner="dots"):
-            parser = create_parser(dump_file)
-
-        # Initialize components
-        kb = BugcheckKnowledgeBase()
-        driver_detector = DriverDetector()
-        ai_analyzer = None
-
-        # Initialize AI if requested
-        if ai:
-            with console.status("[bold blue]初始化AI分析器...", spinner="dots"):
-                config = get_config()
-                if config.zhipu_api_key:
-                    provider = AIProviderFactory.create_from_config(config)
-                    ai_analyzer = AIAnalyzer(provider=provider)
-                else:
-                    console.print("[yellow]警告: ZHIPU_API_KEY未配置，AI分析已禁用[/yellow]")
-
-        # Run analysis
-        with Progress(
-            SpinnerColumn(),
-            TextColumn("[progress.description]{task.description}"),
-            console=console,
-        ) as progress:
-            task = progress.add_task("分析崩溃中...", total=None)
-            analyzer = BSODAnalyzer(parser, kb, driver_detector)
-            result = analyzer.analyze(dump_file)
-
-            # Run AI analysis if enabled
-            if ai_analyzer and ai_analyzer.enabled:
-                progress.update(task, description="AI分析中...")
-                result.ai_analysis = ai_analyzer.analyze(
-                    crash_info=result.crash_info,
-                    drivers=result.loaded_drivers,
-                    stack_traces=result.stack_traces,
-                    minidump_info=result.minidump_info,
-                    suspected_driver=result.suspected_driver,
-                )
+        result = run_single_dump(dump_file, ai=ai, save=save, console=console)
 
         # Display result
         if format == "json":
@@ -122,12 +93,6 @@ def analyze(dump_file: str, output: Optional[str], format: str, ai: bool, save:
         else:
             display_analysis_result_rich(result)
 
-        # Save to database
-        if save:
-            db = DatabaseManager()
-            db.save_analysis(result)
-            console.print("\n[green]✓[/green] 分析结果已保存到数据库")
-
         # Save to file
         if output:
             save_result_to_file(result, output, format)
@@ -147,18 +112,67 @@ def analyze(dump_file: str, output: Optional[str], format: str, ai: bool, save:
         sys.exit(1)
 
 
+def _analyze_one(dump_file: str):
+    """分析单个dump文件（模块级函数，便于进程池序列化）。
+
+    Args:
+        dump_file: dump文件路径
+
+    Returns:
+        AnalysisResult 分析结果
+    """
+    p = Path(dump_file).resolve()
+    st = p.stat()
+    return _analyze_cached((str(p), st.st_size, st.st_mtime_ns))
+
+
+@functools.lru_cache(maxsize=128)
+def _analyze_cached(key: tuple):
+    """按文件稳定标识缓存的分析入口。
+
+    同一个dump常出现在多个扫描位置（Minidump目录+用户备份），
+    以 (解析后路径, 大小, mtime_ns) 为键，进程内再次遇到时
+    直接复用结果，跳过整个解析+分析。
+
+    Args:
+        key: (resolved_path, size, mtime_ns) 三元组
+
+    Returns:
+        AnalysisResult 分析结果
+    """
+    from bsod_analyzer.cli._runner import _get_components
+    from bsod_analyzer.core.parser import create_parser
+    from bsod_analyzer.core.analyzer import BSODAnalyzer
+
+    dump_file = key[0]
+    parser = create_parser(dump_file)
+    kb, driver_detector = _get_components()
+    analyzer = BSODAnalyzer(parser, kb, driver_detector)
+    return analyzer.analyze(dump_file)
+
+
 @cli.command()
 @click.argument("dump_dir", type=click.Path(exists=True, file_okay=False))
 @click.option("--limit", "-n", type=int, default=10, help="最多分析的文件数")
 @click.option("--pattern", "-p", default="*.dmp", help="文件匹配模式")
 @click.option("--save", is_flag=True, help="保存所有结果到数据库")
-def batch(dump_dir: str, limit: int, pattern: str, save: bool):
+@click.option("--jobs", "-j", type=int, default=None, help="并行分析进程数（默认: CPU核心数）")
+def batch(dump_dir: str, limit: int, pattern: str, save: bool, jobs: Optional[int]):
     """批量分析目录中的dump文件
 
     示例:
         bsod batch "C:/Windows/Minidump"
         bsod batch ./dumps --limit 5 --save
+        bsod batch ./dumps -j 4
     """
+    from rich.progress import (
+        BarColumn,
+        Progress,
+        SpinnerColumn,
+        TaskProgressColumn,
+        TextColumn,
+    )
+
     dump_files = list(Path(dump_dir).glob(pattern))[:limit]
 
     if not dump_files:
@@ -167,33 +181,49 @@ def batch(dump_dir: str, limit: int, pattern: str, save: bool):
 
     console.print(f"找到 [cyan]{len(dump_files)}[/cyan] 个dump文件")
 
+    # 每个文件的解析互相独立，用进程池并行分析；
+    # 数据库写入保留在主进程，收集完结果后统一落库
+    max_workers = min(jobs or os.cpu_count() or 1, len(dump_files))
+
     results = []
-    for i, dump_file in enumerate(dump_files, 1):
-        console.print(f"\n[{i}/{len(dump_files)}] 分析 [cyan]{dump_file.name}[/cyan]...")
+    # 整个批次共用一个 Progress：rich 的实时渲染线程只启动一次
+    with ProcessPoolExecutor(max_workers=max_workers) as executor, Progress(
+        SpinnerColumn(),
+        TextColumn("[progress.description]{task.description}"),
+        BarColumn(),
+        TaskProgressColumn(),
+        console=console,
+    ) as progress:
+        futures = [executor.submit(_analyze_one, str(p)) for p in dump_files]
+        task = progress.add_task("批量分析", total=len(dump_files))
+
+        for dump_file, future in zip(dump_files, futures):
+            progress.update(task, description=f"分析 {dump_file.name}")
+
+            try:
+                result = future.result()
+                results.append(result)
+
+                # Display brief result
+                driver_name = result.suspected_driver.name if result.suspected_driver else "未知"
+                console.print(
+                    f"  [green]✓[/green] {dump_file.name} → {result.crash_info.bugcheck_name}: "
+                    f"[yellow]{driver_name}[/yellow] (置信度: {result.confidence:.0%})"
+                )
 
-        try:
-            parser = create_parser(str(dump_file))
-            kb = BugcheckKnowledgeBase()
-            driver_detector = DriverDetector()
-            analyzer = BSODAnalyzer(parser, kb, driver_detector)
-
-            result = analyzer.analyze(str(dump_file))
-            results.append(result)
-
-            # Display brief result
-            driver_name = result.suspected_driver.name if result.suspected_driver else "未知"
-            console.print(
-                f"  [green]✓[/green] {result.crash_info.bugcheck_name}: "
-                f"[yellow]{driver_name}[/yellow] (置信度: {result.confidence:.0%})"
-            )
+            except Exception as e:
+                console.print(f"  [red]✗[/red] {dump_file.name} 分析失败: {e}")
 
-            # Save if requested
-            if save:
-                db = DatabaseManager()
-                db.save_analysis(result)
+            progress.update(task, advance=1)
 
-        except Exception as e:
-            console.print(f"  [red]✗[/red] 分析失败: {e}")
+    # Save if requested
+    if save and results:
+        from bsod_analyzer.database.manager import DatabaseManager
+
+        db = DatabaseManager()
+        # One batched insert: a single transaction/fsync for the whole
+        # run instead of one per dump
+        db.save_analyses(results)
 
     # Display summary
     console.print(f"\n[bold]批量分析完成: {len(results)}/{len(dump_files)} 成功[/bold]")
@@ -210,6 +240,9 @@ def history(limit: int, days: Optional[int]):
         bsod history --limit 50
         bsod history --days 7
     """
+    from bsod_analyzer.utils.formatters import display_crash_history
+    from bsod_analyzer.database.manager import DatabaseManager
+
     db = DatabaseManager()
     records = db.get_crash_history(limit=limit, days=days)
 
@@ -230,6 +263,11 @@ def patterns(days: int, ai: bool):
         bsod patterns
         bsod patterns --days 7 --ai
     """
+    from rich.panel import Panel
+
+    from bsod_analyzer.utils.formatters import display_statistics
+    from bsod_analyzer.database.manager import DatabaseManager
+
     db = DatabaseManager()
     records = db.get_crash_history(limit=1000, days=days)
 
@@ -243,16 +281,18 @@ def patterns(days: int, ai: bool):
 
     # AI pattern analysis
     if ai:
-        config = get_config()
-        ai_analyzer = AIAnalyzer.from_config(config)
+        from bsod_analyzer.cli._runner import _get_ai_analyzer
 
-        if ai_analyzer.enabled:
+        ai_analyzer = _get_ai_analyzer()
+
+        if ai_analyzer and ai_analyzer.enabled:
             console.print("\n[bold blue]AI模式分析[/bold blue]")
 
-            # Prepare crash data
+            # Prepare crash data（绑定 isoformat，跳过每行的属性查找）
+            _iso = datetime.isoformat
             crash_data = [
                 {
-                    "timestamp": r.crash_time.isoformat(),
+                    "timestamp": _iso(r.crash_time),
                     "bugcheck_code": r.bugcheck_code,
                     "bugcheck_name": r.bugcheck_name,
                     "suspected_driver": r.suspected_driver or "未知",
@@ -271,6 +311,8 @@ def patterns(days: int, ai: bool):
 @cli.command()
 def config():
     """显示当前配置"""
+    from rich.table import Table
+
     cfg = get_config()
 
     table = Table(title="当前配置", show_header=True)
@@ -289,14 +331,42 @@ def config():
     console.print("\n提示: 通过.env文件或环境变量配置ZHIPU_API_KEY")
 
 
-def find_system_dump_files() -> List[Path]:
-    """查找系统中的所有崩溃转储文件。
+@dataclass(slots=True, frozen=True)
+class DumpEntry:
+    """扫描到的 dump 文件及其缓存的元数据。
 
-    Returns:
-        找到的 dump 文件列表（按修改时间降序排列）
+    size/mtime 在扫描时一次性捕获，后续排序、去重和表格
+    展示都复用缓存值，不再触发额外的 stat() 系统调用。
+    签名按需读取后通过 dataclasses.replace 补充。
     """
-    dump_files = []
 
+    path: Path
+    size: int
+    mtime: float
+    sig: bytes = b""
+
+
+#: 识别 dump 文件的扩展名（统一用小写比较，大小写不敏感）
+_DUMP_SUFFIXES = (".dmp", ".mdmp")
+
+#: 文件签名到转储类型的映射（Minidump 是4字节签名，其余8字节）
+_DUMP_TYPES = {
+    b"MDMP": "Minidump",
+    b"PAGEDU64": "完整内存转储",
+    b"PAGEDU48": "内核转储(x86)",
+}
+
+
+def _iter_dump_entries() -> Iterator[DumpEntry]:
+    """遍历系统中的崩溃转储文件，去重后逐个产出。
+
+    使用 os.scandir 单次遍历每个目录，DirEntry 自带缓存的
+    stat 信息，每个文件只产生一次 stat 系统调用。去重在
+    产出时完成（同一文件可能出现在多个扫描位置）。
+
+    Yields:
+        去重后的 DumpEntry 条目
+    """
     # Windows 系统中的常见 dump 文件位置
     dump_locations = [
         # Minidump 文件（最常见）
@@ -311,6 +381,10 @@ def find_system_dump_files() -> List[Path]:
         Path.cwd(),
     ]
 
+    # 文件名哈希与大小折叠成单个整数作为去重键：
+    # 比 (name, size) 元组条目省约四分之三内存，哈希也只算一次
+    seen: set = set()
+
     console.print("[cyan]扫描系统崩溃转储文件...[/cyan]")
 
     for location in dump_locations:
@@ -320,44 +394,80 @@ def find_system_dump_files() -> List[Path]:
         console.print(f"  扫描: {location}")
 
         try:
-            # 查找所有 .dmp 和 .mdmp 文件
-            for pattern in ["*.dmp", "*.DMP", "*.mdmp", "*.MDMP"]:
-                for file_path in location.glob(pattern):
+            # 查找所有 .dmp 和 .mdmp 文件（大小写不敏感，单次遍历）
+            with os.scandir(location) as it:
+                for entry in it:
+                    if not entry.name.lower().endswith(_DUMP_SUFFIXES):
+                        continue
                     # 跳过目录
-                    if file_path.is_dir():
+                    if entry.is_dir():
                         continue
+                    st = entry.stat()
                     # 跳过正在使用的文件（大小为0）
-                    if file_path.stat().st_size == 0:
+                    if st.st_size == 0:
+                        continue
+                    file_key = hash(entry.name) ^ (st.st_size & 0xFFFFFFFFFFFFFFFF)
+                    if file_key in seen:
                         continue
-                    dump_files.append(file_path)
+                    seen.add(file_key)
+                    yield DumpEntry(
+                        path=Path(entry.path), size=st.st_size, mtime=st.st_mtime
+                    )
         except PermissionError:
             console.print(f"    [yellow]权限不足，跳过[/yellow]")
         except Exception as e:
             console.print(f"    [yellow]扫描错误: {e}[/yellow]")
 
-    # 按修改时间降序排序（最新的在前）
-    dump_files.sort(key=lambda p: p.stat().st_mtime, reverse=True)
 
-    # 去重（可能在不同目录中找到同一个文件）
-    seen = set()
-    unique_files = []
-    for f in dump_files:
-        # 使用文件路径作为唯一标识
-        file_key = (f.name, f.stat().st_size)
-        if file_key not in seen:
-            seen.add(file_key)
-            unique_files.append(f)
+def find_system_dump_files(limit: Optional[int] = None) -> List[DumpEntry]:
+    """查找系统中的崩溃转储文件。
+
+    Args:
+        limit: 只返回最新的N个文件；None 返回全部
+
+    Returns:
+        找到的 dump 文件条目列表（按修改时间降序排列）
+    """
+    if limit is not None:
+        # 只要最新的K个时用堆：O(N log K) 而非全量排序的 O(N log N)
+        return heapq.nlargest(limit, _iter_dump_entries(), key=lambda e: e.mtime)
+
+    return sorted(_iter_dump_entries(), key=lambda e: e.mtime, reverse=True)
+
+
+def _read_signature(path: str) -> bytes:
+    """读取文件开头8字节的格式签名。
 
-    return unique_files
+    直接用 os.open/os.read，跳过缓冲IO对象的构造开销；
+    读取失败（文件被占用/已删除）时返回空字节串。
+
+    Args:
+        path: 文件路径
+
+    Returns:
+        前8字节签名，失败时为 b""
+    """
+    try:
+        fd = os.open(path, os.O_RDONLY | getattr(os, "O_BINARY", 0))
+        try:
+            return os.read(fd, 8)
+        finally:
+            os.close(fd)
+    except OSError:
+        return b""
+
+
+#: 文件大小单位，索引即 1024 的幂次
+_SIZE_UNITS = ("B", "KB", "MB", "GB", "TB")
 
 
 def format_file_size(size_bytes: int) -> str:
-    """格式化文件大小。"""
-    for unit in ["B", "KB", "MB", "GB"]:
-        if size_bytes < 1024.0:
-            return f"{size_bytes:.1f} {unit}"
-        size_bytes /= 1024.0
-    return f"{size_bytes:.1f} TB"
+    """格式化文件大小。
+
+    用 bit_length 直接算出单位幂次，单次除法替代逐级除以1024的循环。
+    """
+    index = min((max(size_bytes, 1).bit_length() - 1) // 10, len(_SIZE_UNITS) - 1)
+    return f"{size_bytes / (1 << (10 * index)):.1f} {_SIZE_UNITS[index]}"
 
 
 @cli.command()
@@ -375,6 +485,12 @@ def scan(analyze: bool, limit: int, all: bool, save: bool, ai: bool):
         bsod scan -a --ai --save    # 扫描，用 AI 分析最新的并保存
         bsod scan --all              # 显示所有找到的文件
     """
+    from rich.panel import Panel
+    from rich.table import Table
+
+    from bsod_analyzer.cli._runner import run_single_dump
+    from bsod_analyzer.utils.formatters import display_analysis_result_rich
+
     console.print(Panel.fit(
         "[bold cyan]系统崩溃转储文件扫描器[/bold cyan]\n"
         "将扫描以下位置:\n"
@@ -385,8 +501,8 @@ def scan(analyze: bool, limit: int, all: bool, save: bool, ai: bool):
         border_style="cyan"
     ))
 
-    # 查找所有 dump 文件
-    dump_files = find_system_dump_files()
+    # 查找 dump 文件（默认只取最新的 limit 个，走堆的快速路径）
+    dump_files = find_system_dump_files(limit=None if all else limit)
 
     if not dump_files:
         console.print("\n[yellow]未找到任何崩溃转储文件[/yellow]")
@@ -409,30 +525,32 @@ def scan(analyze: bool, limit: int, all: bool, save: bool, ai: bool):
     table.add_column("修改时间", style="green")
     table.add_column("类型", style="blue")
 
-    for i, file_path in enumerate(dump_files[:display_limit], 1):
-        # 获取文件信息
-        stat = file_path.stat()
-        size_str = format_file_size(stat.st_size)
+    # 批量读取签名：IO密集，用线程池让磁盘寻道重叠
+    shown = dump_files[:display_limit]
+    with ThreadPoolExecutor(max_workers=min(8, len(shown))) as executor:
+        shown = [
+            replace(entry, sig=sig)
+            for entry, sig in zip(
+                shown, executor.map(lambda e: _read_signature(str(e.path)), shown)
+            )
+        ]
+
+    for i, entry in enumerate(shown, 1):
+        # 文件信息在扫描时已捕获，这里不再调用 stat()
+        size_str = format_file_size(entry.size)
 
         # 获取修改时间
-        mtime = datetime.fromtimestamp(stat.st_mtime)
+        mtime = datetime.fromtimestamp(entry.mtime)
         time_str = mtime.strftime("%Y-%m-%d %H:%M:%S")
 
         # 确定文件类型
-        with open(file_path, "rb") as f:
-            signature = f.read(8)
-            if signature[:4] == b"MDMP":
-                file_type = "Minidump"
-            elif signature[:8] == b"PAGEDU64":
-                file_type = "完整内存转储"
-            elif signature[:8] == b"PAGEDU48":
-                file_type = "内核转储(x86)"
-            else:
-                file_type = "未知"
+        file_type = (
+            _DUMP_TYPES.get(entry.sig[:4]) or _DUMP_TYPES.get(entry.sig[:8]) or "未知"
+        )
 
         table.add_row(
             str(i),
-            file_path.name,
+            entry.path.name,
             size_str,
             time_str,
             file_type
@@ -442,58 +560,19 @@ def scan(analyze: bool, limit: int, all: bool, save: bool, ai: bool):
 
     # 如果用户请求自动分析
     if analyze and dump_files:
-        latest_file = dump_files[0]
+        latest_file = dump_files[0].path
 
         console.print(f"\n[bold]分析最新的崩溃文件:[/bold] [cyan]{latest_file.name}[/cyan]")
         console.print(f"路径: {latest_file}\n")
 
         try:
-            # 使用现有的 analyze 逻辑
-            parser = create_parser(str(latest_file))
-            kb = BugcheckKnowledgeBase()
-            driver_detector = DriverDetector()
-            ai_analyzer = None
-
-            # 初始化 AI（如果请求）
-            if ai:
-                config = get_config()
-                if config.zhipu_api_key:
-                    provider = AIProviderFactory.create_from_config(config)
-                    ai_analyzer = AIAnalyzer(provider=provider)
-                else:
-                    console.print("[yellow]警告: ZHIPU_API_KEY未配置，AI分析已禁用[/yellow]")
-
-            # 运行分析
-            with Progress(
-                SpinnerColumn(),
-                TextColumn("[progress.description]{task.description}"),
-                console=console,
-            ) as progress:
-                task = progress.add_task("分析崩溃中...", total=None)
-                analyzer = BSODAnalyzer(parser, kb, driver_detector)
-                result = analyzer.analyze(str(latest_file))
-
-                # AI 分析（如果请求）
-                if ai_analyzer and ai_analyzer.enabled:
-                    progress.update(task, description="AI分析中...")
-                    result.ai_analysis = ai_analyzer.analyze(
-                        crash_info=result.crash_info,
-                        drivers=result.loaded_drivers,
-                        stack_traces=result.stack_traces,
-                        minidump_info=result.minidump_info,
-                        suspected_driver=result.suspected_driver,
-                    )
+            # 与 analyze 命令共用同一条分析流水线
+            result = run_single_dump(str(latest_file), ai=ai, save=save, console=console)
 
             # 显示结果
             console.print()
             display_analysis_result_rich(result)
 
-            # 保存到数据库（如果请求）
-            if save:
-                db = DatabaseManager()
-                db.save_analysis(result)
-                console.print("\n[green]✓[/green] 分析结果已保存到数据库")
-
         except Exception as e:
             console.print(f"\n[red]分析失败: {e}[/red]")
             import traceback
@@ -504,9 +583,26 @@ def scan(analyze: bool, limit: int, all: bool, save: bool, ai: bool):
         console.print(f"示例: [cyan]bsod scan --analyze[/cyan]")
 
 
+def run(argv: List[str]):
+    """供长驻宿主进程复用的入口。
+
+    命令组和 Context 树在模块导入时已构建完毕；常驻进程
+    （看门狗/托盘监控按崩溃事件反复调用）走这里只付
+    argv 解析 + 分发的成本，也不会像 standalone 模式那样
+    在出错时直接 sys.exit。
+
+    Args:
+        argv: 命令行参数列表（不含程序名）
+
+    Returns:
+        命令的返回值
+    """
+    return cli.main(args=argv, standalone_mode=False, prog_name="bsod")
+
+
 def main():
     """Main entry point."""
-    cli()
+    cli(prog_name="bsod")
 
 
 if __name__ == "__main__":
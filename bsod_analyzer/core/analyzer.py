@@ -4,8 +4,12 @@ BSOD analysis engine.
 Core analyzer that combines parsing, detection, and AI analysis.
 """
 
-from typing import List, Optional
+import bisect
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, List, Optional
 from collections import Counter
+from statistics import fmean
 from loguru import logger
 
 from bsod_analyzer.core.parser import IMinidumpParser
@@ -20,6 +24,10 @@ from bsod_analyzer.database.models import (
 )
 
 
+# Bugcheck codes seen often enough that diagnosis is well understood
+_COMMON_BUGCHECKS: frozenset = frozenset({0x0A, 0x3B, 0xD1, 0x50, 0x7E, 0x1E})
+
+
 class BSODAnalyzer:
     """Blue Screen of Death analysis engine."""
 
@@ -28,6 +36,7 @@ class BSODAnalyzer:
         parser: IMinidumpParser,
         kb: Optional[BugcheckKnowledgeBase] = None,
         driver_detector: Optional[DriverDetector] = None,
+        parser_factory: Optional[Callable[[str], IMinidumpParser]] = None,
     ):
         """Initialize the analyzer.
 
@@ -35,10 +44,20 @@ class BSODAnalyzer:
             parser: Minidump parser instance
             kb: Bugcheck knowledge base (optional, will create if None)
             driver_detector: Driver detector (optional, will create if None)
+            parser_factory: Picklable callable building a parser for a
+                dump path; enables process-pool analyze_multiple()
         """
         self.parser = parser
         self.kb = kb or BugcheckKnowledgeBase()
         self.driver_detector = driver_detector or DriverDetector()
+        self.parser_factory = parser_factory
+        # Address index over the loaded drivers, rebuilt per analyze()
+        self._drivers: List[DriverInfo] = []
+        self._sorted_drivers: List[DriverInfo] = []
+        self._base_addrs: List[int] = []
+        self._end_addrs: List[int] = []
+        self._first_problematic: Optional[DriverInfo] = None
+        self._problematic_scanned = False
 
     def analyze(self, dump_file: str, use_ai: bool = False) -> AnalysisResult:
         """Perform complete analysis of a dump file.
@@ -52,41 +71,38 @@ class BSODAnalyzer:
         """
         logger.info(f"Starting analysis of: {dump_file}")
 
-        # Step 1: Parse basic information
-        logger.debug("Parsing minidump info...")
-        minidump_info = self.parser.parse(dump_file)
-
-        # Step 2: Extract crash information
-        logger.debug("Extracting crash info...")
-        crash_info = self.parser.extract_crash_info()
-
-        # Step 3: Get loaded drivers
-        logger.debug("Getting loaded drivers...")
-        drivers = self.parser.get_loaded_drivers()
+        # Steps 1-4: single fused pass over the dump
+        logger.debug("Parsing dump (info, crash, drivers, stacks)...")
+        minidump_info, crash_info, drivers, stack_traces = self.parser.parse_all(dump_file)
 
-        # Step 4: Get stack traces
-        logger.debug("Getting stack traces...")
-        stack_traces = self.parser.get_stack_traces()
+        self._index_drivers(drivers)
 
         # Step 5: Find suspected driver
         logger.debug("Finding suspected driver...")
-        suspected_driver = self._find_suspected_driver(crash_info, drivers, stack_traces)
+        suspected_driver = self._find_suspected_driver(crash_info, stack_traces)
+
+        # Queried once; every later step threads this bool through
+        sp_problematic = suspected_driver is not None and self.driver_detector.is_problematic(
+            suspected_driver
+        )
 
         # Step 6: Determine cause
         logger.debug("Determining cause...")
-        suspected_cause = self._determine_cause(crash_info, suspected_driver, stack_traces)
+        suspected_cause = self._determine_cause(crash_info, suspected_driver, sp_problematic)
 
         # Step 7: Generate recommendations
         logger.debug("Generating recommendations...")
-        recommendations = self._generate_recommendations(crash_info, suspected_driver)
+        recommendations = self._generate_recommendations(crash_info, suspected_driver, sp_problematic)
 
         # Step 8: Calculate confidence
         logger.debug("Calculating confidence...")
-        confidence = self._calculate_confidence(crash_info, suspected_driver, stack_traces)
+        confidence = self._calculate_confidence(
+            crash_info, suspected_driver, stack_traces, sp_problematic
+        )
 
         # Update problematic flag on suspected driver
         if suspected_driver:
-            suspected_driver.is_problematic = self.driver_detector.is_problematic(suspected_driver)
+            suspected_driver.is_problematic = sp_problematic
 
         result = AnalysisResult(
             dump_file=dump_file,
@@ -105,34 +121,40 @@ class BSODAnalyzer:
         return result
 
     def _find_suspected_driver(
-        self, crash_info: CrashInfo, drivers: List[DriverInfo], stack_traces: List[StackTrace]
+        self, crash_info: CrashInfo, stack_traces: List[StackTrace]
     ) -> Optional[DriverInfo]:
         """Find the most likely problematic driver.
 
-        Uses multiple strategies:
-        1. Check stack top frames
-        2. Check known problematic drivers
-        3. Check crash address location
+        Candidate priority, all served from the index built by
+        _index_drivers:
+        1. Stack-top driver that is known-bad or non-system
+        2. First known-problematic driver in the load list
+        3. Driver containing the crash address
         """
         # Strategy 1: Check stack top frames
         for trace in stack_traces:
             if trace.frames:
                 top_frame = trace.frames[0]
-                driver = self._find_driver_by_address(drivers, top_frame.instruction_address)
+                driver = self._find_driver_by_address(top_frame.instruction_address)
                 if driver:
+                    # A known-bad driver on the stack top is the answer;
+                    # no need to ever scan the full load list
+                    if self.driver_detector.is_problematic(driver):
+                        logger.debug(f"Suspected driver from stack (known bad): {driver.name}")
+                        return driver
                     # Exclude system drivers if possible
                     if not self.driver_detector.is_system_driver(driver.name):
                         logger.debug(f"Suspected driver from stack: {driver.name}")
                         return driver
 
-        # Strategy 2: Check known problematic drivers
-        for driver in drivers:
-            if self.driver_detector.is_problematic(driver):
-                logger.debug(f"Suspected driver from known bad list: {driver.name}")
-                return driver
+        # Strategy 2: First known problematic driver in the load list
+        first_bad = self._find_first_problematic()
+        if first_bad:
+            logger.debug(f"Suspected driver from known bad list: {first_bad.name}")
+            return first_bad
 
         # Strategy 3: Check crash address
-        crash_driver = self._find_driver_by_address(drivers, crash_info.crash_address)
+        crash_driver = self._find_driver_by_address(crash_info.crash_address)
         if crash_driver:
             logger.debug(f"Suspected driver from crash address: {crash_driver.name}")
             return crash_driver
@@ -140,15 +162,47 @@ class BSODAnalyzer:
         logger.debug("No specific driver identified")
         return None
 
-    def _find_driver_by_address(self, drivers: List[DriverInfo], address: int) -> Optional[DriverInfo]:
-        """Find driver that contains the given address."""
-        for driver in drivers:
-            if driver.base_address <= address < driver.base_address + driver.size:
-                return driver
+    def _index_drivers(self, drivers: List[DriverInfo]) -> None:
+        """Build the per-dump driver index for address lookups.
+
+        Base and end addresses are kept as flat int lists so the hot
+        lookup path touches no DriverInfo attributes.
+        """
+        self._drivers = drivers
+        self._sorted_drivers = sorted(drivers, key=lambda d: d.base_address)
+        self._base_addrs = [d.base_address for d in self._sorted_drivers]
+        self._end_addrs = [d.base_address + d.size for d in self._sorted_drivers]
+        self._first_problematic = None
+        self._problematic_scanned = False
+
+    def _find_first_problematic(self) -> Optional[DriverInfo]:
+        """Scan the load list for a known-bad driver, at most once per dump.
+
+        Deferred so the scan is skipped entirely when a stack-top frame
+        already identifies the suspect.
+        """
+        if not self._problematic_scanned:
+            is_problematic = self.driver_detector.is_problematic
+            self._first_problematic = next(
+                (d for d in self._drivers if is_problematic(d)), None
+            )
+            self._problematic_scanned = True
+        return self._first_problematic
+
+    def _find_driver_by_address(self, address: int) -> Optional[DriverInfo]:
+        """Find driver that contains the given address.
+
+        Binary search over the sorted base-address index: the candidate
+        is the driver with the greatest base address not above the
+        target, verified against its range.
+        """
+        idx = bisect.bisect_right(self._base_addrs, address) - 1
+        if idx >= 0 and address < self._end_addrs[idx]:
+            return self._sorted_drivers[idx]
         return None
 
     def _determine_cause(
-        self, crash_info: CrashInfo, suspected_driver: Optional[DriverInfo], stack_traces: List[StackTrace]
+        self, crash_info: CrashInfo, suspected_driver: Optional[DriverInfo], sp_problematic: bool
     ) -> str:
         """Determine the root cause description."""
         # Get base description from knowledge base
@@ -161,7 +215,7 @@ class BSODAnalyzer:
 
         # Add suspected driver info
         if suspected_driver:
-            if self.driver_detector.is_problematic(suspected_driver):
+            if sp_problematic:
                 known_issue = self.driver_detector.get_known_issue(suspected_driver)
                 return f"{base_cause} Known issue: {known_issue}"
             else:
@@ -169,34 +223,51 @@ class BSODAnalyzer:
 
         return base_cause
 
-    def _generate_recommendations(self, crash_info: CrashInfo, suspected_driver: Optional[DriverInfo]) -> List[str]:
+    def _generate_recommendations(
+        self, crash_info: CrashInfo, suspected_driver: Optional[DriverInfo], sp_problematic: bool
+    ) -> List[str]:
         """Generate actionable recommendations."""
+        # Knowledge-base entries carry stable ids; dedup via bitmask
         recommendations = []
-
-        # Get general recommendations from knowledge base
-        recommendations.extend(self.kb.get_recommendations(crash_info.bugcheck_code))
-
-        # Add driver-specific recommendations
+        mask = 0
+        for rec_id, text in self.kb.get_recommendation_ids(crash_info.bugcheck_code):
+            bit = 1 << rec_id
+            if not mask & bit:
+                mask |= bit
+                recommendations.append(text)
+
+        # Driver-specific recommendations are free-form strings
+        extras = []
         if suspected_driver:
-            if self.driver_detector.is_problematic(suspected_driver):
+            if sp_problematic:
                 rec = self.driver_detector.get_recommendation(suspected_driver)
                 if rec:
-                    recommendations.append(f"Driver-specific: {rec}")
+                    extras.append(f"Driver-specific: {rec}")
             else:
-                recommendations.append(f"Update '{suspected_driver.name}' to the latest version")
+                extras.append(f"Update '{suspected_driver.name}' to the latest version")
 
-        # Analyze driver patterns
-        if suspected_driver:
             driver_type = self.driver_detector.classify_driver(suspected_driver)
             if driver_type == "graphics":
-                recommendations.append("Graphics drivers are often the cause - try a clean install of GPU drivers")
+                extras.append("Graphics drivers are often the cause - try a clean install of GPU drivers")
             elif driver_type == "network":
-                recommendations.append("Network driver issues - update or temporarily disable network adapters")
+                extras.append("Network driver issues - update or temporarily disable network adapters")
+
+        if extras:
+            # Free-form strings fall back to dict-based order-preserving dedup
+            seen = dict.fromkeys(recommendations)
+            for text in extras:
+                if text not in seen:
+                    seen[text] = None
+                    recommendations.append(text)
 
-        return list(set(recommendations))  # Remove duplicates
+        return recommendations
 
     def _calculate_confidence(
-        self, crash_info: CrashInfo, suspected_driver: Optional[DriverInfo], stack_traces: List[StackTrace]
+        self,
+        crash_info: CrashInfo,
+        suspected_driver: Optional[DriverInfo],
+        stack_traces: List[StackTrace],
+        sp_problematic: bool = False,
     ) -> float:
         """Calculate confidence score (0.0 - 1.0)."""
         confidence = 0.5  # Base confidence
@@ -210,12 +281,11 @@ class BSODAnalyzer:
             confidence += 0.15
 
         # Known problematic driver - high confidence
-        if suspected_driver and self.driver_detector.is_problematic(suspected_driver):
+        if sp_problematic:
             confidence += 0.25
 
         # Common bugcheck codes
-        common_codes = [0x0A, 0x3B, 0xD1, 0x50, 0x7E, 0x1E]
-        if crash_info.bugcheck_code in common_codes:
+        if crash_info.bugcheck_code in _COMMON_BUGCHECKS:
             confidence += 0.1
 
         return min(confidence, 1.0)
@@ -223,20 +293,36 @@ class BSODAnalyzer:
     def analyze_multiple(self, dump_files: List[str]) -> List[AnalysisResult]:
         """Analyze multiple dump files.
 
+        Each dump is independent and CPU-bound, so when a picklable
+        parser_factory is available the batch is fanned out over a
+        process pool; otherwise the files are analyzed serially.
+
         Args:
             dump_files: List of dump file paths
 
         Returns:
-            List of analysis results
+            List of analysis results (in input order, failures skipped)
         """
-        results = []
+        if self.parser_factory is None or len(dump_files) < 2:
+            results = []
+            for dump_file in dump_files:
+                try:
+                    results.append(self.analyze(dump_file))
+                except Exception as e:
+                    logger.error(f"Failed to analyze {dump_file}: {e}")
+            return results
 
-        for dump_file in dump_files:
-            try:
-                result = self.analyze(dump_file)
-                results.append(result)
-            except Exception as e:
-                logger.error(f"Failed to analyze {dump_file}: {e}")
+        results = []
+        with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+            futures = [
+                executor.submit(_analyze_worker, self.parser_factory, dump_file)
+                for dump_file in dump_files
+            ]
+            for dump_file, future in zip(dump_files, futures):
+                try:
+                    results.append(future.result())
+                except Exception as e:
+                    logger.error(f"Failed to analyze {dump_file}: {e}")
 
         return results
 
@@ -252,16 +338,16 @@ class BSODAnalyzer:
         if not results:
             return {}
 
-        # Count bugcheck codes
-        bugcheck_counts = Counter(r.crash_info.bugcheck_code for r in results)
-
-        # Count suspected drivers
-        driver_counts = Counter(
-            r.suspected_driver.name if r.suspected_driver else "Unknown" for r in results
-        )
+        # One pass collects code counts, driver counts and confidences
+        bugcheck_counts: Counter = Counter()
+        driver_counts: Counter = Counter()
+        confidences = []
+        for r in results:
+            bugcheck_counts[r.crash_info.bugcheck_code] += 1
+            driver_counts[r.suspected_driver.name if r.suspected_driver else "Unknown"] += 1
+            confidences.append(r.confidence)
 
-        # Average confidence
-        avg_confidence = sum(r.confidence for r in results) / len(results)
+        avg_confidence = fmean(confidences)
 
         return {
             "total_crashes": len(results),
@@ -270,3 +356,15 @@ class BSODAnalyzer:
             "average_confidence": avg_confidence,
             "most_common_bugcheck": bugcheck_counts.most_common(1)[0] if bugcheck_counts else None,
         }
+
+
+def _analyze_worker(
+    parser_factory: Callable[[str], IMinidumpParser], dump_file: str
+) -> AnalysisResult:
+    """Analyze one dump in a pool worker, rebuilding the parser locally.
+
+    Parser instances hold open file handles and do not pickle, so each
+    worker constructs its own from the factory.
+    """
+    analyzer = BSODAnalyzer(parser_factory(dump_file))
+    return analyzer.analyze(dump_file)
@@ -4,6 +4,7 @@ Bugcheck code knowledge base.
 Provides information about Windows bugcheck codes and common causes.
 """
 
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional, List
 
@@ -278,9 +279,28 @@ BUGCHECK_CODES = {
 class BugcheckKnowledgeBase:
     """Knowledge base for bugcheck codes."""
 
+    _FALLBACK_RECOMMENDATIONS = [
+        "Check Event Viewer for detailed error information",
+        "Update Windows and all drivers",
+        "Run System File Checker (sfc /scannow)",
+    ]
+
     def __init__(self):
         """Initialize the knowledge base."""
         self._data = BUGCHECK_CODES
+        # Assign every distinct recommendation a stable small-int id so
+        # callers can deduplicate with a bitmask instead of hashing
+        rec_ids: dict = {}
+        self._rec_pairs = {}
+        for code, info in self._data.items():
+            self._rec_pairs[code] = [
+                (rec_ids.setdefault(text, len(rec_ids)), text)
+                for text in info["recommendations"]
+            ]
+        self._fallback_pairs = [
+            (rec_ids.setdefault(text, len(rec_ids)), text)
+            for text in self._FALLBACK_RECOMMENDATIONS
+        ]
 
     def get_bugcheck_info(self, code: int) -> tuple[str, str]:
         """Get bugcheck name and description for a code."""
@@ -305,12 +325,26 @@ class BugcheckKnowledgeBase:
         """Get recommendations for a bugcheck code."""
         if code in self._data:
             return self._data[code]["recommendations"]
-        return [
-            "Check Event Viewer for detailed error information",
-            "Update Windows and all drivers",
-            "Run System File Checker (sfc /scannow)",
-        ]
+        return self._FALLBACK_RECOMMENDATIONS
+
+    def get_recommendation_ids(self, code: int) -> List[tuple[int, str]]:
+        """Get recommendations for a bugcheck code as (id, text) pairs.
+
+        Ids are stable per process and index a bit in a dedup mask.
+        """
+        return self._rec_pairs.get(code, self._fallback_pairs)
 
     def get_all_codes(self) -> dict:
         """Get all bugcheck codes."""
         return self._data
+
+
+@lru_cache(maxsize=1)
+def get_default_kb() -> BugcheckKnowledgeBase:
+    """Return the shared knowledge-base instance.
+
+    The KB is immutable after construction, so parsers share one
+    instance instead of rebuilding the recommendation-id tables on
+    every bugcheck lookup.
+    """
+    return BugcheckKnowledgeBase()
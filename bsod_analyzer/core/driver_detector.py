@@ -5,211 +5,253 @@ Identifies problematic drivers based on known issues and patterns.
 """
 
 import json
+import pickle
+import re
 from pathlib import Path
 from typing import Optional, List, Dict
 
 from loguru import logger
 
 from bsod_analyzer.database.models import DriverInfo
-from bsod_analyzer.utils.config import get_config
-
-
-# Known problematic drivers database
-KNOWN_BAD_DRIVERS = {
-    # Graphics drivers
-    "nvlddmkm.sys": {
-        "issue": "NVIDIA GPU driver - known to cause BSOD with certain configurations",
-        "recommendation": "Update to latest NVIDIA driver or perform clean install",
-    },
-    "amdkmdag.sys": {
-        "issue": "AMD GPU driver - can cause crashes with certain hardware",
-        "recommendation": "Update AMD graphics drivers",
-    },
-    "igdkmd64.sys": {
-        "issue": "Intel GPU driver - may cause system instability",
-        "recommendation": "Update Intel graphics driver",
-    },
-    # Network drivers
-    "rtwlanu.sys": {
-        "issue": "Realtek USB WiFi driver - known stability issues",
-        "recommendation": "Update Realtek driver or use alternative WiFi adapter",
-    },
-    "netr28x.sys": {
-        "issue": "Ralink network driver - can cause BSOD",
-        "recommendation": "Update or replace network driver",
-    },
-    # Antivirus/Security
-    "avgtdix.sys": {
-        "issue": "AVG Antivirus driver - known conflicts",
-        "recommendation": "Update AVG or temporarily disable for testing",
-    },
-    "avghwnda.sys": {
-        "issue": "AVG driver component",
-        "recommendation": "Update AVG Antivirus",
-    },
-    "bdss.sys": {
-        "issue": "BitDefender security driver",
-        "recommendation": "Update BitDefender or check for conflicts",
-    },
-    "symefa.sys": {
-        "issue": "Symantec/Norton driver",
-        "recommendation": "Update Norton Security",
-    },
-    "symevent.sys": {
-        "issue": "Symantec event driver",
-        "recommendation": "Update or remove Symantec product",
-    },
-    "epfwwfp.sys": {
-        "issue": "ESET firewall driver",
-        "recommendation": "Update ESET Security",
-    },
-    # Storage drivers
-    "iaStorA.sys": {
-        "issue": "Intel RST driver - can cause BSOD with certain SSDs",
-        "recommendation": "Update Intel Rapid Storage Technology driver",
-    },
-    "iaStorV.sys": {
-        "issue": "Intel storage driver",
-        "recommendation": "Update Intel RST driver",
-    },
-    # Virtualization
-    "vmm.sys": {
-        "issue": "VirtualBox memory manager",
-        "recommendation": "Update VirtualBox or disable if not in use",
-    },
-    "vboxdrv.sys": {
-        "issue": "VirtualBox driver",
-        "recommendation": "Update VirtualBox",
-    },
-    "vmci.sys": {
-        "issue": "VMware CI driver",
-        "recommendation": "Update VMware Workstation",
-    },
-    # Game/Audio
-    "rgl64vk.sys": {
-        "issue": "Razer game capture driver",
-        "recommendation": "Update Razer software",
-    },
-    " Nahimic.sys": {
-        "issue": "Nahimic audio driver - known BSOD issues",
-        "recommendation": "Update or disable Nahimic audio service",
-    },
-    # Overclocking/Utilities
-    "AiCharger.sys": {
-        "issue": "ASUS AI Charger driver",
-        "recommendation": "Update or remove ASUS AI Suite",
-    },
-    "AsIO.sys": {
-        "issue": "ASUS I/O driver for monitoring",
-        "recommendation": "Update ASUS software",
-    },
-    # Third-party
-    "ks.sys": {
-        "issue": "Windows kernel streaming - usually third-party filter driver issue",
-        "recommendation": "Check audio/video capture software drivers",
-    },
+
+
+# Known-bad driver tables: bundled base database plus user-extendable
+# custom entries, merged lazily on first DriverDetector() construction
+_KNOWLEDGE_DIR = Path(__file__).parent.parent / "knowledge"
+_BASE_DB_PATH = _KNOWLEDGE_DIR / "base_bad_drivers.json"
+_CUSTOM_DB_PATH = _KNOWLEDGE_DIR / "known_bad_drivers.json"
+_CACHE_PATH = _KNOWLEDGE_DIR / "known_bad.pkl"
+
+
+def _load_known_bad() -> Dict[str, Dict[str, str]]:
+    """Load the merged known-bad driver database.
+
+    The merged result is pickled next to the JSON sources and reused
+    while it is at least as new as both, so repeat startups skip the
+    JSON parse entirely.
+    """
+    sources = [p for p in (_BASE_DB_PATH, _CUSTOM_DB_PATH) if p.exists()]
+
+    try:
+        if sources and _CACHE_PATH.exists():
+            newest = max(p.stat().st_mtime for p in sources)
+            if _CACHE_PATH.stat().st_mtime >= newest:
+                with open(_CACHE_PATH, "rb") as f:
+                    return pickle.load(f)
+    except Exception as e:
+        logger.warning(f"Failed to read driver database cache: {e}")
+
+    merged: Dict[str, Dict[str, str]] = {}
+    for db_path in sources:
+        try:
+            with open(db_path, "r", encoding="utf-8") as f:
+                # Normalize keys: a stray " Nahimic.sys" entry with a
+                # leading space could otherwise never match a filename
+                merged.update(
+                    {k.strip().lower(): v for k, v in json.load(f).items()}
+                )
+                logger.debug(f"Loaded driver database: {db_path}")
+        except Exception as e:
+            logger.warning(f"Failed to load driver database {db_path}: {e}")
+
+    try:
+        with open(_CACHE_PATH, "wb") as f:
+            pickle.dump(merged, f, protocol=pickle.HIGHEST_PROTOCOL)
+    except OSError as e:
+        logger.debug(f"Could not write driver database cache: {e}")
+
+    return merged
+
+
+# Category keywords for classify_driver, in priority order
+_TYPE_KEYWORDS = {
+    "graphics": ["nvlddmkm", "amdkmdag", "igdkmd", "nvidia", "amd", "intel", "gpu"],
+    "network": ["net", "wifi", "wlan", "ethernet", "realtek", "broadcom"],
+    "storage": ["stor", "disk", "raid", "ahci", "sata"],
+    "audio": ["audio", "sound", "hdaudio", "realtek", "conexant"],
+    "security": ["antivirus", "firewall", "security", "bdss", "avg", "norton"],
+    "virtualization": ["vbox", "vmware", "virtual"],
 }
 
 
+# Windows system modules (lowercase), excluded when hunting for a culprit
+_SYSTEM_DRIVERS: frozenset = frozenset({
+    "ntoskrnl.exe",
+    "hal.dll",
+    "ntkrnlmp.exe",
+    "ntkrnlpa.exe",
+    "kernel32.dll",
+    "ntdll.dll",
+    "win32k.sys",
+    "csrss.exe",
+    "lsass.exe",
+    "services.exe",
+    "svchost.exe",
+    "explorer.exe",
+})
+
+
 class DriverDetector:
     """Detects problematic drivers."""
 
     def __init__(self):
         """Initialize the driver detector."""
-        self._known_bad = KNOWN_BAD_DRIVERS
-        self._load_custom_database()
-
-    def _load_custom_database(self):
-        """Load custom driver database from knowledge folder."""
-        config = get_config()
-        db_path = Path(__file__).parent.parent / "knowledge" / "known_bad_drivers.json"
-
-        if db_path.exists():
-            try:
-                with open(db_path, "r", encoding="utf-8") as f:
-                    custom_data = json.load(f)
-                    self._known_bad.update(custom_data)
-                    logger.debug(f"Loaded custom driver database: {db_path}")
-            except Exception as e:
-                logger.warning(f"Failed to load custom driver database: {e}")
+        self._known_bad = _load_known_bad()
+        self._build_matcher()
+        # Per-driver-name memoization: the analyzer queries the same
+        # suspected driver several times per analysis.
+        self._problematic_cache: Dict[str, bool] = {}
+        self._issue_cache: Dict[str, Optional[str]] = {}
+        self._rec_cache: Dict[str, Optional[str]] = {}
+        self._classify_cache: Dict[str, str] = {}
 
-    def is_problematic(self, driver: DriverInfo) -> bool:
-        """Check if a driver is known to be problematic."""
-        driver_name_lower = driver.name.lower()
+    def _build_matcher(self):
+        """Compile the known-bad names into one multi-pattern matcher.
 
-        for bad_driver in self._known_bad:
-            if bad_driver.lower() in driver_name_lower:
-                return True
+        A single regex alternation scans a driver name once at C speed,
+        replacing the per-call loop over every known-bad entry.
+        """
+        self._known_bad_lower = {
+            k.strip().lower(): v for k, v in self._known_bad.items()
+        }
+        # Longest names first: re tries alternatives in order, so the
+        # most specific entry wins when one name contains another
+        self._bad_pattern = re.compile(
+            "|".join(
+                map(re.escape, sorted(self._known_bad_lower, key=len, reverse=True))
+            )
+        )
+        # Bloom filter over 4-char shingles of the bad names. Most
+        # drivers in a dump are clean; a few bit probes reject them
+        # before the full pattern ever runs. Built and queried in the
+        # same process, so the salted str hash is consistent.
+        # Shingles around the extension dot (".sys", "a.sy", ...) occur
+        # in nearly every queried name and would defeat the filter, so
+        # each bad name contributes its dot-free shingles. A short name
+        # whose shingles all span the dot (e.g. "ks.sys") falls back to
+        # those carrying two stem characters, which stay rare. A
+        # one-character stem ("x.sys") has neither kind, so it falls
+        # back to all of its shingles — a weaker filter beats a silent
+        # false negative. Names too short to shingle at all can't be
+        # pre-tested, so they disable the filter outright.
+        keep: set = set()
+        self._bloom_enabled = True
+        for name in self._known_bad_lower:
+            shingles = [name[i:i + 4] for i in range(len(name) - 3)]
+            if not shingles:
+                self._bloom_enabled = False
+            distinctive = [s for s in shingles if "." not in s]
+            keep.update(
+                distinctive
+                or [s for s in shingles if "." not in s[:2]]
+                or shingles
+            )
+        bits = bytearray(512)  # 4096 bits
+        for shingle in keep:
+            for seed in (0, 1, 2):
+                h = hash((seed, shingle)) & 4095
+                bits[h >> 3] |= 1 << (h & 7)
+        self._bloom_bits = bytes(bits)
+        # One compiled alternation per category, checked in priority
+        # order (a combined pattern would pick by leftmost occurrence
+        # in the name instead).
+        self._type_patterns = [
+            (driver_type, re.compile("|".join(map(re.escape, keywords))))
+            for driver_type, keywords in _TYPE_KEYWORDS.items()
+        ]
+
+    def _bloom_maybe(self, name_lower: str) -> bool:
+        """Cheap pre-test: can any known-bad name occur in this one?
 
+        A match implies every 4-char shingle of the bad name appears in
+        the driver name, so a fully-set shingle is required before the
+        pattern is worth running. No false negatives; rare false
+        positives are confirmed by the full matcher.
+        """
+        if not self._bloom_enabled:
+            return True
+        bits = self._bloom_bits
+        for i in range(len(name_lower) - 3):
+            shingle = name_lower[i:i + 4]
+            for seed in (0, 1, 2):
+                h = hash((seed, shingle)) & 4095
+                if not bits[h >> 3] & (1 << (h & 7)):
+                    break
+            else:
+                return True
         return False
 
+    def _match(self, name_lower: str) -> Optional[Dict[str, str]]:
+        """Return the known-bad payload for a lowered name, if any."""
+        match = self._bad_pattern.search(name_lower)
+        if match:
+            return self._known_bad_lower[match.group(0)]
+        return None
+
+    def is_problematic(self, driver: DriverInfo) -> bool:
+        """Check if a driver is known to be problematic."""
+        key = driver.name_lower
+        cached = self._problematic_cache.get(key)
+        if cached is None:
+            cached = self._bloom_maybe(key) and self._bad_pattern.search(key) is not None
+            self._problematic_cache[key] = cached
+        return cached
+
     def get_known_issue(self, driver: DriverInfo) -> Optional[str]:
         """Get known issue information for a driver."""
-        driver_name_lower = driver.name.lower()
+        key = driver.name_lower
+        if key in self._issue_cache:
+            return self._issue_cache[key]
 
-        for bad_driver, info in self._known_bad.items():
-            if bad_driver.lower() in driver_name_lower:
-                return f"{info['issue']}. {info['recommendation']}"
-
-        return None
+        info = self._match(key)
+        issue = f"{info['issue']}. {info['recommendation']}" if info else None
+        self._issue_cache[key] = issue
+        return issue
 
     def get_recommendation(self, driver: DriverInfo) -> Optional[str]:
         """Get recommendation for a problematic driver."""
-        driver_name_lower = driver.name.lower()
+        key = driver.name_lower
+        if key in self._rec_cache:
+            return self._rec_cache[key]
 
-        for bad_driver, info in self._known_bad.items():
-            if bad_driver.lower() in driver_name_lower:
-                return info["recommendation"]
-
-        return None
+        info = self._match(key)
+        rec = info["recommendation"] if info else None
+        self._rec_cache[key] = rec
+        return rec
 
     def find_problematic_drivers(self, drivers: List[DriverInfo]) -> List[tuple[DriverInfo, str]]:
         """Find all problematic drivers from a list."""
         problematic = []
 
         for driver in drivers:
-            if self.is_problematic(driver):
-                issue = self.get_known_issue(driver)
-                problematic.append((driver, issue))
+            info = self._match(driver.name_lower)
+            if info:
+                problematic.append((driver, f"{info['issue']}. {info['recommendation']}"))
 
         return problematic
 
     def is_system_driver(self, driver_name: str) -> bool:
         """Check if driver is a Windows system driver."""
-        system_drivers = [
-            "ntoskrnl.exe",
-            "hal.dll",
-            "ntkrnlmp.exe",
-            "ntkrnlpa.exe",
-            "kernel32.dll",
-            "ntdll.dll",
-            "win32k.sys",
-            "csrss.exe",
-            "lsass.exe",
-            "services.exe",
-            "svchost.exe",
-            "explorer.exe",
-        ]
-        return driver_name.lower() in [d.lower() for d in system_drivers]
+        return driver_name.lower() in _SYSTEM_DRIVERS
 
     def classify_driver(self, driver: DriverInfo) -> str:
         """Classify driver type."""
-        name_lower = driver.name.lower()
+        name_lower = driver.name_lower
+        cached = self._classify_cache.get(name_lower)
+        if cached is not None:
+            return cached
 
-        if self.is_system_driver(driver.name):
-            return "system"
+        result = self._classify(name_lower)
+        self._classify_cache[name_lower] = result
+        return result
 
-        type_keywords = {
-            "graphics": ["nvlddmkm", "amdkmdag", "igdkmd", "nvidia", "amd", "intel", "gpu"],
-            "network": ["net", "wifi", "wlan", "ethernet", "realtek", "broadcom"],
-            "storage": ["stor", "disk", "raid", "ahci", "sata"],
-            "audio": ["audio", "sound", "hdaudio", "realtek", "conexant"],
-            "security": ["antivirus", "firewall", "security", "bdss", "avg", "norton"],
-            "virtualization": ["vbox", "vmware", "virtual"],
-        }
+    def _classify(self, name_lower: str) -> str:
+        """Compute the driver type for a lowered name (uncached)."""
+        if name_lower in _SYSTEM_DRIVERS:
+            return "system"
 
-        for driver_type, keywords in type_keywords.items():
-            if any(keyword in name_lower for keyword in keywords):
+        for driver_type, pattern in self._type_patterns:
+            if pattern.search(name_lower):
                 return driver_type
 
         return "unknown"
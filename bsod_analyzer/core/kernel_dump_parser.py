@@ -9,6 +9,7 @@ from typing import List, Optional, Dict, Any
 from datetime import datetime
 from loguru import logger
 
+from bsod_analyzer.core.bugcheck_kb import get_default_kb
 from bsod_analyzer.database.models import (
     MinidumpInfo,
     CrashInfo,
@@ -28,6 +29,7 @@ class KernelDumpParser:
             file_path: Path to the dump file
         """
         self.file_path = Path(file_path)
+        self._stat = None
         self._dump = None
         self._validate_file()
         self._load_dump()
@@ -37,7 +39,9 @@ class KernelDumpParser:
         if not self.file_path.exists():
             raise FileNotFoundError(f"Dump file not found: {self.file_path}")
 
-        if self.file_path.stat().st_size == 0:
+        # One stat serves every later size/mtime read
+        self._stat = self.file_path.stat()
+        if self._stat.st_size == 0:
             raise ValueError(f"Empty dump file: {self.file_path}")
 
         # Check for supported signatures
@@ -87,7 +91,7 @@ class KernelDumpParser:
             MinidumpInfo object with basic information
         """
         # Get timestamp from file
-        timestamp = datetime.fromtimestamp(self.file_path.stat().st_mtime)
+        timestamp = datetime.fromtimestamp(self._stat.st_mtime)
 
         # Get CPU architecture from context
         arch = "AMD64"  # kdmp-parser only supports 64-bit dumps
@@ -105,7 +109,7 @@ class KernelDumpParser:
 
         return MinidumpInfo(
             file_path=str(self.file_path),
-            file_size=self.file_path.stat().st_size,
+            file_size=self._stat.st_size,
             timestamp=timestamp,
             computer_name=computer_name,
             os_version=os_version,
@@ -159,10 +163,7 @@ class KernelDumpParser:
 
     def _get_bugcheck_info(self, code: int) -> tuple[str, str]:
         """Get bugcheck name and description."""
-        from bsod_analyzer.core.bugcheck_kb import BugcheckKnowledgeBase
-
-        kb = BugcheckKnowledgeBase()
-        return kb.get_bugcheck_info(code)
+        return get_default_kb().get_bugcheck_info(code)
 
     def get_loaded_drivers(self) -> List[DriverInfo]:
         """Get list of loaded drivers from kernel dump.
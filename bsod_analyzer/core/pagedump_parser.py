@@ -7,6 +7,8 @@ This module provides basic parsing capability for Windows Complete Memory Dump f
 Based on Microsoft Debug Help documentation and DUMP_HEADER structure.
 """
 
+import mmap
+import os
 import struct
 from pathlib import Path
 from typing import Optional, List, Dict, Any
@@ -14,6 +16,7 @@ from datetime import datetime
 from dataclasses import dataclass
 from loguru import logger
 
+from bsod_analyzer.core.bugcheck_kb import get_default_kb
 from bsod_analyzer.database.models import (
     MinidumpInfo,
     CrashInfo,
@@ -23,9 +26,35 @@ from bsod_analyzer.database.models import (
 )
 
 
-@dataclass
+# DUMP_HEADER64 fields up to the bugcheck parameters in one compiled
+# layout (pad bytes skip the reserved regions between them)
+_HEADER_STRUCT = struct.Struct("<8sIIQ24xII8xI4Q")
+
+# Compiled scalar readers; skip the struct-module format-string cache
+_U32 = struct.Struct("<I")
+_U64 = struct.Struct("<Q")
+
+# byte -> printable-or-dot table; lets hex_dump build its ASCII column
+# with one C-level bytes.translate instead of a per-byte loop
+_ASCII_LUT = bytes(b if 32 <= b < 127 else ord(".") for b in range(256))
+
+# The 17 general-purpose registers sit contiguously in the x64 CONTEXT
+# from +0x78 (Rax) through +0xF8 (R15); one unpack reads them all
+_CTX_GPR_STRUCT = struct.Struct("<17Q")
+_CTX_GPR_OFFSET = 0x78
+_CTX_GPR_NAMES = (
+    "Rax", "Rcx", "Rdx", "Rbx", "Rsp", "Rbp", "Rsi", "Rdi",
+    "Rip", "R8", "R9", "R10", "R11", "R12", "R13", "R14", "R15",
+)
+
+
+@dataclass(slots=True, frozen=True)
 class DumpHeader:
-    """PAGEDU64 dump file header structure based on DUMP_HEADER64."""
+    """PAGEDU64 dump file header structure based on DUMP_HEADER64.
+
+    Immutable once parsed; slots keep the per-instance footprint down
+    for batch workloads that build thousands of headers.
+    """
 
     signature: bytes
     valid_dump: int
@@ -46,7 +75,7 @@ class DumpHeader:
     bugcheck_page_offset: int = 0
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ExceptionRecord64:
     """Exception record structure (EXCEPTION_RECORD64)."""
 
@@ -81,67 +110,104 @@ class PageDumpParser:
     IMAGE_FILE_MACHINE_IA64 = 0x0200
     IMAGE_FILE_MACHINE_ARM64 = 0xAA64
 
-    def __init__(self, file_path: str):
+    def __init__(self, file_path: str, signature: Optional[bytes] = None):
         """Initialize the PAGEDU64 parser.
 
         Args:
             file_path: Path to the dump file
+            signature: First 8 bytes of the file, when the caller (e.g.
+                create_parser) has already read them; skips the re-read
         """
         self.file_path = Path(file_path)
+        self._stat = None
         self._header: Optional[DumpHeader] = None
         self._context_data: Optional[bytes] = None
-        self._validate_file()
-        self._parse_header()
+        self._mm: Optional[mmap.mmap] = None
+        self._validate_file(signature)
+        # Header parsing is deferred to the first get_dump_header()
+        # call; raw-byte accessors never pay for it
 
-    def _validate_file(self):
+    def _validate_file(self, signature: Optional[bytes] = None):
         """Validate file exists and has correct signature."""
         if not self.file_path.exists():
             raise FileNotFoundError(f"Dump file not found: {self.file_path}")
 
-        if self.file_path.stat().st_size == 0:
+        # One stat serves every later size/mtime read
+        self._stat = self.file_path.stat()
+        if self._stat.st_size == 0:
             raise ValueError(f"Empty dump file: {self.file_path}")
 
+        # Map the file once; every later read is a slice of the mapping
+        fd = os.open(str(self.file_path), os.O_RDONLY)
+        try:
+            self._mm = mmap.mmap(fd, 0, access=mmap.ACCESS_READ)
+        finally:
+            os.close(fd)
+
         # Check signature
-        signature = self._read_bytes(0, 8)
+        if signature is None:
+            signature = self._read_bytes(0, 8)
         if signature != b"PAGEDU64":
             raise ValueError(
                 f"Invalid PAGEDU64 signature: {signature}. "
                 f"Expected b'PAGEDU64'"
             )
 
-        logger.info(f"Valid PAGEDU64 file: {self.file_path}, size: {self.file_path.stat().st_size:,} bytes")
+        logger.info(f"Valid PAGEDU64 file: {self.file_path}, size: {self._stat.st_size:,} bytes")
 
     def _read_u32(self, offset: int) -> int:
         """Read 32-bit unsigned integer at offset."""
-        data = self._read_bytes(offset, 4)
-        return struct.unpack("<I", data)[0]
+        return _U32.unpack_from(self._mm, offset)[0]
 
     def _read_u64(self, offset: int) -> int:
         """Read 64-bit unsigned integer at offset."""
-        data = self._read_bytes(offset, 8)
-        return struct.unpack("<Q", data)[0]
+        return _U64.unpack_from(self._mm, offset)[0]
 
     def _read_bytes(self, offset: int, size: int) -> bytes:
         """Read raw bytes at offset."""
-        with open(self.file_path, "rb") as f:
-            f.seek(offset)
-            return f.read(size)
+        return self._mm[offset:offset + size]
+
+    def close(self):
+        """Release the underlying memory map."""
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
 
     def _parse_header(self):
         """Parse the dump file header."""
+        (
+            signature,
+            major_version,
+            minor_version,
+            directory_table_base,
+            machine_image_type,
+            number_processors,
+            bugcheck_code,
+            param1,
+            param2,
+            param3,
+            param4,
+        ) = _HEADER_STRUCT.unpack_from(self._mm, 0)
+
         self._header = DumpHeader(
-            signature=self._read_bytes(self.OFFSET_SIGNATURE, 8),
+            signature=signature,
             valid_dump=0,
-            major_version=self._read_u32(self.OFFSET_MAJOR_VERSION),
-            minor_version=self._read_u32(self.OFFSET_MINOR_VERSION),
-            directory_table_base=self._read_u64(self.OFFSET_DIRECTORY_TABLE_BASE),
-            machine_image_type=self._read_u32(self.OFFSET_MACHINE_IMAGE_TYPE),
-            number_processors=self._read_u32(self.OFFSET_NUMBER_PROCESSORS),
-            bugcheck_code=self._read_u32(self.OFFSET_BUGCHECK_CODE),
-            bugcheck_parameter1=self._read_u64(self.OFFSET_BUGCHECK_PARAM1),
-            bugcheck_parameter2=self._read_u64(self.OFFSET_BUGCHECK_PARAM2),
-            bugcheck_parameter3=self._read_u64(self.OFFSET_BUGCHECK_PARAM3),
-            bugcheck_parameter4=self._read_u64(self.OFFSET_BUGCHECK_PARAM4),
+            major_version=major_version,
+            minor_version=minor_version,
+            directory_table_base=directory_table_base,
+            machine_image_type=machine_image_type,
+            number_processors=number_processors,
+            bugcheck_code=bugcheck_code,
+            bugcheck_parameter1=param1,
+            bugcheck_parameter2=param2,
+            bugcheck_parameter3=param3,
+            bugcheck_parameter4=param4,
             scratch_redo_log=0,
             bugcheck_page_offset=0,
         )
@@ -153,12 +219,14 @@ class PageDumpParser:
             f"Processors: {self._header.number_processors}"
         )
 
-        logger.debug(
-            f"Bugcheck params: "
-            f"[0x{self._header.bugcheck_parameter1:X}, "
-            f"0x{self._header.bugcheck_parameter2:X}, "
-            f"0x{self._header.bugcheck_parameter3:X}, "
-            f"0x{self._header.bugcheck_parameter4:X}]"
+        # Lazy formatting: the hex rendering only runs when DEBUG is on
+        header = self._header
+        logger.opt(lazy=True).debug(
+            "Bugcheck params: [0x{:X}, 0x{:X}, 0x{:X}, 0x{:X}]",
+            lambda: header.bugcheck_parameter1,
+            lambda: header.bugcheck_parameter2,
+            lambda: header.bugcheck_parameter3,
+            lambda: header.bugcheck_parameter4,
         )
 
     def get_dump_header(self) -> DumpHeader:
@@ -172,7 +240,7 @@ class PageDumpParser:
         header = self.get_dump_header()
 
         # Get timestamp from file modification time
-        timestamp = datetime.fromtimestamp(self.file_path.stat().st_mtime)
+        timestamp = datetime.fromtimestamp(self._stat.st_mtime)
 
         # Map machine image type to architecture
         arch_map = {
@@ -188,7 +256,7 @@ class PageDumpParser:
 
         return MinidumpInfo(
             file_path=str(self.file_path),
-            file_size=self.file_path.stat().st_size,
+            file_size=self._stat.st_size,
             timestamp=timestamp,
             computer_name="",  # Not directly accessible in PAGEDU64 header
             os_version=f"{header.major_version}.{header.minor_version}",
@@ -208,36 +276,32 @@ class PageDumpParser:
         # For many bugcheck codes, parameter 1 contains the faulting address
         crash_address = header.bugcheck_parameter1
 
+        # Both CrashInfo.parameters and the embedded exception record
+        # carry the same four ints; build the list once and share it
+        parameters = [
+            header.bugcheck_parameter1,
+            header.bugcheck_parameter2,
+            header.bugcheck_parameter3,
+            header.bugcheck_parameter4,
+        ]
+
         return CrashInfo(
             bugcheck_code=header.bugcheck_code,
             bugcheck_name=bugcheck_name,
             bugcheck_description=bugcheck_description,
             crash_address=crash_address,
             crash_thread_id=0,  # Not in header
-            parameters=[
-                header.bugcheck_parameter1,
-                header.bugcheck_parameter2,
-                header.bugcheck_parameter3,
-                header.bugcheck_parameter4,
-            ],
+            parameters=parameters,
             exception_record={
                 "exception_code": header.bugcheck_code,
                 "exception_address": crash_address,
-                "exception_parameters": [
-                    header.bugcheck_parameter1,
-                    header.bugcheck_parameter2,
-                    header.bugcheck_parameter3,
-                    header.bugcheck_parameter4,
-                ],
+                "exception_parameters": parameters,
             },
         )
 
     def _get_bugcheck_info(self, code: int) -> tuple[str, str]:
         """Get bugcheck name and description."""
-        from bsod_analyzer.core.bugcheck_kb import BugcheckKnowledgeBase
-
-        kb = BugcheckKnowledgeBase()
-        return kb.get_bugcheck_info(code)
+        return get_default_kb().get_bugcheck_info(code)
 
     def get_loaded_drivers(self) -> List[DriverInfo]:
         """Get list of loaded drivers from PAGEDU64 dump.
@@ -251,7 +315,7 @@ class PageDumpParser:
         """
         logger.warning("Driver extraction from PAGEDU64 not implemented")
         logger.info(
-            f"PS_LOADED_MODULE_LIST is at 0x{self._header.ps_loaded_module_list:X}, "
+            f"PS_LOADED_MODULE_LIST is at 0x{self.get_dump_header().ps_loaded_module_list:X}, "
             "but parsing requires memory walking"
         )
         return []
@@ -267,6 +331,24 @@ class PageDumpParser:
         logger.warning("Stack trace extraction from PAGEDU64 not implemented")
         return []
 
+    def parse_all(
+        self, file_path: str
+    ) -> tuple[MinidumpInfo, CrashInfo, List[DriverInfo], List[StackTrace]]:
+        """Parse the dump once and extract everything in file order.
+
+        Mirrors IMinidumpParser.parse_all so the analyzer can drive
+        both parser types through one call; this class doesn't
+        implement the full interface (no exception-record stream in
+        PAGEDU64), so it provides the method directly.
+        """
+        minidump_info = self.parse(file_path)
+        return (
+            minidump_info,
+            self.extract_crash_info(),
+            self.get_loaded_drivers(),
+            self.get_stack_traces(),
+        )
+
     def get_context_registers(self) -> Dict[str, int]:
         """Get CPU register values from context record.
 
@@ -281,11 +363,10 @@ class PageDumpParser:
         registers = {}
 
         try:
-            # Read potential context data
-            ctx_data = self._read_bytes(ctx_offset, 16)
-
-            # Check if it's valid (not just PAGE filler)
-            if ctx_data == b"PAGEPAGEPAGEPA":
+            # Check if it's valid (not just PAGE filler); compare the
+            # mmap slice directly. The old literal was 14 bytes against
+            # a 16-byte read, so the filler check could never match.
+            if self._mm[ctx_offset:ctx_offset + 16] == b"PAGEPAGEPAGEPAGE":
                 logger.debug(f"No valid CONTEXT record at offset 0x{ctx_offset:X}")
                 return {}
 
@@ -306,43 +387,22 @@ class PageDumpParser:
             # CONTEXT.x64 member offsets (simplified)
             # The actual layout depends on CONTEXT_FLAGS
             # Full context would include segment registers, floats, etc.
-
-            # Read P1Home through P6Home and standard registers
-            # These are typically at fixed offsets in CONTEXT
             ctx_size = 0x4F0  # Size of x64 CONTEXT structure
 
             # Check if we have enough data
-            if self.file_path.stat().st_size < offset + ctx_size:
+            if self._stat.st_size < offset + ctx_size:
                 logger.debug("Not enough data for full CONTEXT structure")
                 return {}
 
-            # Parse register context (simplified)
-            # Offsets are based on CONTEXT having CONTEXT_FULL | CONTEXT_DEBUG_REGISTERS
-            reg_offsets = {
-                "Rax": 0x78,   # P1Home
-                "Rcx": 0x80,   # P2Home
-                "Rdx": 0x88,   # P3Home
-                "Rbx": 0x90,
-                "Rsp": 0x98,
-                "Rbp": 0xA0,
-                "Rsi": 0xA8,
-                "Rdi": 0xB0,
-                "Rip": 0xB8,   # This is the most important!
-                "R8": 0xC0,    # P4Home
-                "R9": 0xC8,    # P5Home
-                "R10": 0xD0,   # P6Home
-                "R11": 0xD8,
-                "R12": 0xE0,
-                "R13": 0xE8,
-                "R14": 0xF0,
-                "R15": 0xF8,
-            }
-
-            for reg_name, reg_offset in reg_offsets.items():
-                val = self._read_u64(offset + reg_offset)
-                registers[reg_name] = val
-
-            logger.debug(f"Extracted registers: RIP=0x{registers.get('Rip', 0):X}")
+            # The GPR block is contiguous; one compiled unpack replaces
+            # seventeen per-register reads. Offsets are based on CONTEXT
+            # having CONTEXT_FULL | CONTEXT_DEBUG_REGISTERS.
+            values = _CTX_GPR_STRUCT.unpack_from(self._mm, offset + _CTX_GPR_OFFSET)
+            registers = dict(zip(_CTX_GPR_NAMES, values))
+
+            logger.opt(lazy=True).debug(
+                "Extracted registers: RIP=0x{:X}", lambda: registers.get("Rip", 0)
+            )
 
         except Exception as e:
             logger.debug(f"Failed to parse x64 context: {e}")
@@ -376,10 +436,15 @@ class PageDumpParser:
         data = self._read_bytes(offset, size)
         lines = []
 
+        # Format the whole region in two C calls, then slice per row:
+        # each byte occupies a 3-char stride in the hex string, so row
+        # boundaries are plain string offsets
+        hex_all = data.hex(" ").upper()
+        ascii_all = data.translate(_ASCII_LUT).decode("latin1")
+
         for i in range(0, len(data), 16):
-            chunk = data[i:i+16]
-            hex_part = " ".join(f"{b:02X}" for b in chunk)
-            ascii_part = "".join(chr(b) if 32 <= b < 127 else "." for b in chunk)
+            hex_part = hex_all[3 * i:3 * (i + 16) - 1]
+            ascii_part = ascii_all[i:i + 16]
             lines.append(f"{offset + i:08X}: {hex_part:<48} {ascii_part}")
 
         return "\n".join(lines)
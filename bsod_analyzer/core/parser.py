@@ -5,13 +5,18 @@ Uses the skelsec/minidump library to parse Windows crash dump files.
 Also supports PAGEDU64 format (Windows Complete Memory Dump) via PageDumpParser.
 """
 
+import bisect
+import os
 from abc import ABC, abstractmethod
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
+from itertools import islice
 from pathlib import Path
-from typing import Optional, List
+from typing import Iterator, Optional, List
 
 from loguru import logger
 
+from bsod_analyzer.core.bugcheck_kb import get_default_kb
 from bsod_analyzer.database.models import (
     MinidumpInfo,
     CrashInfo,
@@ -49,38 +54,72 @@ class IMinidumpParser(ABC):
         """Get exception record."""
         pass
 
+    def parse_all(
+        self, file_path: str
+    ) -> tuple[MinidumpInfo, CrashInfo, List[DriverInfo], List[StackTrace]]:
+        """Parse the dump once and extract everything in file order.
+
+        The default implementation chains the four extraction calls
+        over the single load done by parse(); implementations with
+        their own stream layout can override to fuse further.
+        """
+        minidump_info = self.parse(file_path)
+        return (
+            minidump_info,
+            self.extract_crash_info(),
+            self.get_loaded_drivers(),
+            self.get_stack_traces(),
+        )
+
 
 class MinidumpParser(IMinidumpParser):
     """Minidump parser using skelsec/minidump library."""
 
-    def __init__(self, file_path: str):
+    def __init__(self, file_path: str, signature: Optional[bytes] = None):
+        """Initialize the parser.
+
+        Args:
+            file_path: Path to the dump file
+            signature: First 8 bytes of the file, when the caller (e.g.
+                create_parser) has already read them; skips a re-open
+        """
         self.file_path = Path(file_path)
+        self._stat = None
         self._minidump = None
         self._dump_type = None
-        self._validate_file()
+        self._module_index = None
+        # Memoized extraction results; the pipeline asks for these
+        # repeatedly and the dump never changes under a parser
+        self._crash_info: Optional[CrashInfo] = None
+        self._exception_record: Optional[dict] = None
+        self._exception_fetched = False
+        self._validate_file(signature)
         self._load_minidump()
 
-    def _validate_file(self):
+    def _validate_file(self, signature: Optional[bytes] = None):
         """Validate file exists and has correct signature."""
         if not self.file_path.exists():
             raise FileNotFoundError(f"Dump file not found: {self.file_path}")
 
-        if self.file_path.stat().st_size == 0:
+        # One stat serves every later size/mtime read
+        self._stat = self.file_path.stat()
+        if self._stat.st_size == 0:
             raise ValueError(f"Empty dump file: {self.file_path}")
 
         # Validate file signature - support both MDMP and kernel dump formats
-        with open(self.file_path, "rb") as f:
-            signature = f.read(8)
-            # Standard minidump
-            if signature[:4] == b"MDMP":
-                self._dump_type = "minidump"
-            # Kernel dump formats
-            elif signature[:8] == b"PAGEDU64":
-                self._dump_type = "kernel_x64"
-            elif signature[:8] == b"PAGEDU48":
-                self._dump_type = "kernel_x86"
-            else:
-                raise ValueError(f"Invalid dump file signature: {signature[:8].hex()}")
+        if signature is None:
+            with open(self.file_path, "rb") as f:
+                signature = f.read(8)
+        # Standard minidump
+        if signature[:4] == b"MDMP":
+            self._dump_type = "minidump"
+        # Kernel dump formats
+        elif signature[:8] == b"PAGEDU64":
+            self._dump_type = "kernel_x64"
+        elif signature[:8] == b"PAGEDU48":
+            self._dump_type = "kernel_x86"
+        else:
+            raise ValueError(f"Invalid dump file signature: {signature[:8].hex()}")
 
     def _load_minidump(self):
         """Load minidump file."""
@@ -124,7 +163,7 @@ class MinidumpParser(IMinidumpParser):
 
         return MinidumpInfo(
             file_path=str(self.file_path),
-            file_size=self.file_path.stat().st_size,
+            file_size=self._stat.st_size,
             timestamp=timestamp,
             computer_name=computer_name,
             os_version=os_version,
@@ -135,6 +174,9 @@ class MinidumpParser(IMinidumpParser):
 
     def extract_crash_info(self) -> CrashInfo:
         """Extract crash information from minidump."""
+        if self._crash_info is not None:
+            return self._crash_info
+
         # Try to get exception record
         exception = self.get_exception_record()
 
@@ -154,26 +196,23 @@ class MinidumpParser(IMinidumpParser):
         if exception:
             crash_thread_id = exception.get("thread_id", 0)
 
-        return CrashInfo(
+        self._crash_info = CrashInfo(
             bugcheck_code=bugcheck_code,
             bugcheck_name=bugcheck_name,
             bugcheck_description=bugcheck_description,
             crash_address=crash_address,
             crash_thread_id=crash_thread_id,
             exception_record=exception,
-            parameters=self._get_bugcheck_parameters(),
+            parameters=self._get_bugcheck_parameters(exception),
         )
+        return self._crash_info
 
     def _get_bugcheck_info(self, code: int) -> tuple[str, str]:
         """Get bugcheck name and description."""
-        from bsod_analyzer.core.bugcheck_kb import BugcheckKnowledgeBase
+        return get_default_kb().get_bugcheck_info(code)
 
-        kb = BugcheckKnowledgeBase()
-        return kb.get_bugcheck_info(code)
-
-    def _get_bugcheck_parameters(self) -> List[int]:
-        """Get bugcheck parameters from exception record."""
-        exception = self.get_exception_record()
+    def _get_bugcheck_parameters(self, exception: Optional[dict]) -> List[int]:
+        """Get bugcheck parameters from an already-fetched exception record."""
         if exception and "exception_parameters" in exception:
             return exception["exception_parameters"]
         return []
@@ -183,18 +222,18 @@ class MinidumpParser(IMinidumpParser):
         drivers = []
 
         try:
-            for module in self._minidump.modules.modules:
-                driver_name = module.name.name.decode("utf-8", errors="ignore")
-
-                # Parse timestamp
-                timestamp = datetime.fromtimestamp(module.time_date_stamp)
+            if self._module_index is None:
+                self._build_module_index()
 
+            # Names were decoded when the index was built; iterate the
+            # load-order view so the driver list keeps the dump's order
+            for base, end, name, time_date_stamp in self._modules_decoded:
                 drivers.append(
                     DriverInfo(
-                        name=driver_name,
-                        base_address=module.base_address,
-                        size=module.size,
-                        timestamp=timestamp,
+                        name=name,
+                        base_address=base,
+                        size=end - base,
+                        timestamp=datetime.fromtimestamp(time_date_stamp),
                     )
                 )
 
@@ -206,80 +245,113 @@ class MinidumpParser(IMinidumpParser):
 
         return drivers
 
-    def get_stack_traces(self) -> List[StackTrace]:
-        """Get stack traces for crashed threads."""
-        traces = []
+    def iter_stack_traces(self) -> Iterator[StackTrace]:
+        """Yield stack traces one thread at a time.
 
+        Callers that only need the crashed thread's trace can stop
+        after the first yield instead of paying for every thread.
+        """
         try:
-            # Get thread list
-            threads = self._minidump.threads
-
-            for thread in threads.threads:
-                frames = []
-
-                try:
-                    # Get stack frames
-                    stack_frames = thread.stack.walk()
-
-                    for frame in stack_frames:
-                        # Find module for this address
-                        module_name = self._find_module_for_address(frame.instruction_address)
-
-                        frames.append(
-                            StackFrame(
-                                instruction_address=frame.instruction_address,
-                                module_name=module_name,
-                                offset=0,
-                            )
+            threads = self._minidump.threads.threads
+        except AttributeError:
+            logger.warning("No thread information found in minidump")
+            return
+
+        for thread in threads:
+            frames = []
+
+            try:
+                # islice stops the walker at the frame cap instead of
+                # truncating after the work is done
+                for frame in islice(thread.stack.walk(), 50):
+                    # Find module for this address
+                    module_name = self._find_module_for_address(frame.instruction_address)
+
+                    frames.append(
+                        StackFrame(
+                            instruction_address=frame.instruction_address,
+                            module_name=module_name,
+                            offset=0,
                         )
+                    )
 
-                        # Limit frames
-                        if len(frames) >= 50:
-                            break
+            except Exception as e:
+                logger.debug(f"Error reading stack for thread: {e}")
+                continue
 
-                except Exception as e:
-                    logger.debug(f"Error reading stack for thread: {e}")
-                    continue
+            if frames:
+                yield StackTrace(thread_id=thread.thread_id, frames=frames)
 
-                if frames:
-                    traces.append(StackTrace(thread_id=thread.thread_id, frames=frames))
+    def get_stack_traces(self) -> List[StackTrace]:
+        """Get stack traces for crashed threads."""
+        traces = []
 
+        try:
+            traces = list(self.iter_stack_traces())
             logger.debug(f"Found {len(traces)} stack traces")
-
-        except AttributeError:
-            logger.warning("No thread information found in minidump")
         except Exception as e:
             logger.error(f"Error parsing stack traces: {e}")
 
         return traces
 
+    def _build_module_index(self):
+        """Build the sorted module-address index, decoding names once.
+
+        Stack walking probes an address per frame; bisecting flat base
+        and end lists replaces a linear scan that re-decoded every
+        module name on every probe. Names are decoded exactly once
+        here; get_loaded_drivers reuses them via _modules_decoded,
+        which preserves the dump's load order.
+        """
+        self._modules_decoded = [
+            (
+                module.base_address,
+                module.base_address + module.size,
+                module.name.name.decode("utf-8", errors="ignore"),
+                module.time_date_stamp,
+            )
+            for module in self._minidump.modules.modules
+        ]
+        mods = sorted(self._modules_decoded, key=lambda entry: entry[0])
+        self._module_bases = [base for base, _, _, _ in mods]
+        self._module_ends = [end for _, end, _, _ in mods]
+        self._module_names = [name for _, _, name, _ in mods]
+        self._module_index = mods
+
     def _find_module_for_address(self, address: int) -> str:
         """Find module name for given address."""
-        try:
-            for module in self._minidump.modules.modules:
-                if module.base_address <= address < module.base_address + module.size:
-                    return module.name.name.decode("utf-8", errors="ignore")
-        except Exception:
-            pass
+        if self._module_index is None:
+            try:
+                self._build_module_index()
+            except Exception:
+                return "Unknown"
+        idx = bisect.bisect_right(self._module_bases, address) - 1
+        if idx >= 0 and address < self._module_ends[idx]:
+            return self._module_names[idx]
         return "Unknown"
 
     def get_exception_record(self) -> Optional[dict]:
         """Get exception record if available."""
-        try:
-            if hasattr(self._minidump, "exception") and self._minidump.exception:
-                exc = self._minidump.exception.exception
-
-                return {
-                    "exception_code": exc.exception_code,
-                    "exception_flags": exc.exception_flags,
-                    "exception_address": exc.exception_address,
-                    "thread_id": exc.thread_id,
-                    "exception_parameters": getattr(exc, "exception_parameters", []),
-                }
-        except (AttributeError, Exception) as e:
-            logger.debug(f"No exception record found: {e}")
+        if self._exception_fetched:
+            return self._exception_record
+
+        # getattr probes instead of try/except: a missing stream is the
+        # common case and should not pay for exception construction
+        exc_stream = getattr(self._minidump, "exception", None)
+        exc = getattr(exc_stream, "exception", None) if exc_stream else None
+        if exc is not None:
+            self._exception_record = {
+                "exception_code": getattr(exc, "exception_code", 0),
+                "exception_flags": getattr(exc, "exception_flags", 0),
+                "exception_address": getattr(exc, "exception_address", 0),
+                "thread_id": getattr(exc, "thread_id", 0),
+                "exception_parameters": getattr(exc, "exception_parameters", []),
+            }
+        else:
+            logger.debug("No exception record found")
 
-        return None
+        self._exception_fetched = True
+        return self._exception_record
 
     def get_memory_regions(self) -> List[dict]:
         """Get memory region information."""
@@ -331,7 +403,8 @@ def create_parser(file_path: str) -> IMinidumpParser:
     if path.stat().st_size == 0:
         raise ValueError(f"Empty dump file: {path}")
 
-    # Read signature to determine format
+    # Read signature to determine format; the parsers accept it so the
+    # file is not re-opened just to sniff the same 8 bytes again
     with open(path, "rb") as f:
         signature = f.read(8)
 
@@ -339,15 +412,67 @@ def create_parser(file_path: str) -> IMinidumpParser:
     if signature[:8] == b"PAGEDU64":
         logger.info(f"Detected PAGEDU64 format (Complete Memory Dump): {file_path}")
         from bsod_analyzer.core.pagedump_parser import PageDumpParser
-        return PageDumpParser(file_path)
+        return PageDumpParser(file_path, signature=signature)
 
     # Standard minidump format
     if signature[:4] == b"MDMP":
         logger.info(f"Detected Minidump format: {file_path}")
-        return MinidumpParser(file_path)
+        return MinidumpParser(file_path, signature=signature)
 
     # Unknown format
     raise ValueError(
         f"Unsupported dump file signature: {signature[:8].hex()}. "
         f"Expected 'MDMP' (Minidump) or 'PAGEDU64' (Complete Memory Dump)."
     )
+
+
+def _parse_one(file_path: str) -> tuple[MinidumpInfo, CrashInfo, List[DriverInfo]]:
+    """Parse a single dump in a pool worker.
+
+    Parsers hold open file handles and do not pickle, so each worker
+    builds its own via create_parser and returns only the extracted
+    data.
+    """
+    parser = create_parser(file_path)
+    return (
+        parser.parse(file_path),
+        parser.extract_crash_info(),
+        parser.get_loaded_drivers(),
+    )
+
+
+def parse_many(
+    file_paths: List[str],
+) -> List[tuple[MinidumpInfo, CrashInfo, List[DriverInfo]]]:
+    """Parse a batch of dump files, fanning out over a process pool.
+
+    Each dump is independent, so batches are spread across cores;
+    single files and empty batches are parsed in-process. Results come
+    back in input order; files that fail to parse are logged and
+    skipped.
+
+    Args:
+        file_paths: List of dump file paths
+
+    Returns:
+        List of (MinidumpInfo, CrashInfo, drivers) tuples
+    """
+    results = []
+
+    if len(file_paths) < 2:
+        for file_path in file_paths:
+            try:
+                results.append(_parse_one(file_path))
+            except Exception as e:
+                logger.error(f"Failed to parse {file_path}: {e}")
+        return results
+
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+        futures = [executor.submit(_parse_one, file_path) for file_path in file_paths]
+        for file_path, future in zip(file_paths, futures):
+            try:
+                results.append(future.result())
+            except Exception as e:
+                logger.error(f"Failed to parse {file_path}: {e}")
+
+    return results
@@ -4,9 +4,16 @@ Database manager for storing crash history.
 Uses SQLite to persist crash analysis results.
 """
 
+import atexit
+import os
+import queue
 import sqlite3
 import json
-from datetime import datetime, timedelta
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from operator import attrgetter
 from pathlib import Path
 from typing import List, Optional
 from loguru import logger
@@ -15,6 +22,153 @@ from bsod_analyzer.database.models import AnalysisResult, CrashHistory
 from bsod_analyzer.utils.config import get_config
 
 
+# Hot statements as module constants: sqlite3's per-connection
+# statement cache matches on the SQL text, so identical strings keep
+# the prepared plan alive across calls. Any future dynamic WHERE
+# clauses should be added as further fixed templates here, never by
+# concatenating values into the SQL.
+_SQL_INSERT = """
+    INSERT INTO crash_history (
+        dump_file_path, crash_time, bugcheck_code, bugcheck_name,
+        suspected_driver, confidence, analysis_result, ai_analysis
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+_SQL_SELECT_HISTORY = """
+    SELECT * FROM crash_history
+    ORDER BY crash_time DESC LIMIT ?
+"""
+
+_SQL_SELECT_HISTORY_DAYS = """
+    SELECT * FROM crash_history
+    WHERE crash_time >= ?
+    ORDER BY crash_time DESC LIMIT ?
+"""
+
+_SQL_BY_ID = "SELECT * FROM crash_history WHERE id = ?"
+
+# All three statistics in one statement: the cutoff binds once (named
+# parameter shared by every branch) and each row carries a kind tag
+# the caller dispatches on. The branches hit crash_history directly —
+# a materialized CTE would hide the covering indexes each aggregate
+# is built to scan.
+_SQL_STATS = """
+    SELECT 'total' AS kind, NULL AS a, NULL AS b, COUNT(*) AS count
+    FROM crash_history
+    WHERE crash_time >= :cutoff
+    UNION ALL
+    SELECT * FROM (
+        SELECT 'bugcheck', bugcheck_code, bugcheck_name, COUNT(*) AS count
+        FROM crash_history
+        WHERE crash_time >= :cutoff
+        GROUP BY bugcheck_code, bugcheck_name
+        ORDER BY count DESC
+        LIMIT 5
+    )
+    UNION ALL
+    SELECT * FROM (
+        SELECT 'driver', suspected_driver, NULL, COUNT(*) AS count
+        FROM crash_history
+        WHERE crash_time >= :cutoff AND suspected_driver IS NOT NULL
+        GROUP BY suspected_driver
+        ORDER BY count DESC
+        LIMIT 5
+    )
+"""
+
+_SQL_DELETE_OLD = """
+    DELETE FROM crash_history
+    WHERE crash_time < ?
+"""
+
+# Whole schema bootstrap as one script: executescript runs it in a
+# single transaction, so first start pays one durability barrier
+# instead of one per statement
+_SQL_SCHEMA = """
+    BEGIN;
+
+    CREATE TABLE IF NOT EXISTS crash_history (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        dump_file_path TEXT NOT NULL,
+        crash_time INTEGER NOT NULL,
+        bugcheck_code INTEGER NOT NULL,
+        bugcheck_name TEXT NOT NULL,
+        suspected_driver TEXT,
+        confidence REAL DEFAULT 0.0,
+        analysis_result TEXT,
+        ai_analysis TEXT,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    );
+
+    CREATE INDEX IF NOT EXISTS idx_crash_time
+    ON crash_history(crash_time DESC);
+
+    CREATE INDEX IF NOT EXISTS idx_bugcheck_code
+    ON crash_history(bugcheck_code);
+
+    -- Covering index for the bugcheck aggregate: group columns first
+    -- so the GROUP BY walks the index in order (no temp B-tree),
+    -- crash_time last so the cutoff is answered without the table
+    CREATE INDEX IF NOT EXISTS idx_bc_ct
+    ON crash_history(bugcheck_code, bugcheck_name, crash_time);
+
+    -- Partial covering index for the driver aggregate; NULL
+    -- suspected_driver rows are excluded by the stats query anyway
+    CREATE INDEX IF NOT EXISTS idx_drv_ct
+    ON crash_history(suspected_driver, crash_time)
+    WHERE suspected_driver IS NOT NULL;
+
+    COMMIT;
+"""
+
+# Fetches all three driver attributes in one C call per driver
+_DRIVER_FIELDS = attrgetter("name", "base_address", "size")
+
+
+class _ReadPool:
+    """Fixed pool of read-only connections for the query methods.
+
+    WAL mode lets any number of readers run alongside the single
+    writer, so queries check a connection out of the queue instead of
+    contending for the writer's lock.
+    """
+
+    def __init__(self, db_path: Path, size: int):
+        self._connections = queue.Queue()
+        for _ in range(size):
+            conn = sqlite3.connect(
+                f"file:{db_path}?mode=ro",
+                uri=True,
+                check_same_thread=False,
+                cached_statements=256,
+            )
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA temp_store=MEMORY")
+            conn.execute("PRAGMA cache_size=-64000")
+            self._connections.put(conn)
+
+    @contextmanager
+    def connection(self):
+        """Check a connection out for the duration of one query."""
+        conn = self._connections.get()
+        try:
+            yield conn
+        finally:
+            # A connection returned mid-transaction would pin its WAL
+            # snapshot and serve stale reads to the next borrower
+            if conn.in_transaction:
+                conn.rollback()
+            self._connections.put(conn)
+
+    def close(self):
+        """Close every pooled connection."""
+        while True:
+            try:
+                self._connections.get_nowait().close()
+            except queue.Empty:
+                break
+
+
 class DatabaseManager:
     """Manager for crash history database."""
 
@@ -29,96 +183,183 @@ class DatabaseManager:
             db_path = config.get_database_path()
 
         self.db_path = db_path
+        # One writer connection for the manager's lifetime: a per-call
+        # open pays file open, schema parse and cache warm-up every
+        # time. The lock serializes writers since check_same_thread is
+        # off; reads go through the read-only pool instead.
+        self._lock = threading.Lock()
+        self._readers = None
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(
+            self.db_path, check_same_thread=False, cached_statements=256
+        )
+        # Name-based row access; rows stay cheap C objects, no dicts
+        self._conn.row_factory = sqlite3.Row
+        self._configure_connection()
         self._ensure_database()
+        # Near-free statistics refresh, capped by analysis_limit
+        self._conn.execute("PRAGMA optimize")
+        # Queries run on read-only connections so a dashboard polling
+        # statistics never queues behind an in-flight batch insert
+        self._readers = _ReadPool(self.db_path, os.cpu_count() or 1)
+        # Flush statistics at interpreter exit even when callers never
+        # close() explicitly
+        atexit.register(self.close)
+
+    def _configure_connection(self):
+        """Apply per-connection PRAGMAs, once at open."""
+        # WAL lets readers run alongside writes; NORMAL sync is durable
+        # enough under WAL and drops an fsync per transaction
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA temp_store=MEMORY")
+        self._conn.execute("PRAGMA cache_size=-64000")
+        # Cap how many rows ANALYZE samples so PRAGMA optimize stays cheap
+        self._conn.execute("PRAGMA analysis_limit=400")
+
+    def close(self):
+        """Refresh planner statistics and close all connections."""
+        if self._readers is not None:
+            self._readers.close()
+            self._readers = None
+        if self._conn is not None:
+            try:
+                # Opportunistically update sqlite_stat1 so the next
+                # process opens with fresh query plans
+                self._conn.execute("PRAGMA optimize")
+            except sqlite3.Error:
+                pass
+            self._conn.close()
+            self._conn = None
+
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
 
     def _ensure_database(self):
-        """Create database and tables if they don't exist."""
-        # Create parent directory
-        self.db_path.parent.mkdir(parents=True, exist_ok=True)
-
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-
-        # Create crash_history table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS crash_history (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                dump_file_path TEXT NOT NULL,
-                crash_time TIMESTAMP NOT NULL,
-                bugcheck_code INTEGER NOT NULL,
-                bugcheck_name TEXT NOT NULL,
-                suspected_driver TEXT,
-                confidence REAL DEFAULT 0.0,
-                analysis_result TEXT,
-                ai_analysis TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        """)
-
-        # Create indexes for common queries
-        cursor.execute("""
-            CREATE INDEX IF NOT EXISTS idx_crash_time
-            ON crash_history(crash_time DESC)
-        """)
-
-        cursor.execute("""
-            CREATE INDEX IF NOT EXISTS idx_bugcheck_code
-            ON crash_history(bugcheck_code)
-        """)
-
-        conn.commit()
-        conn.close()
+        """Create tables if they don't exist."""
+        cursor = self._conn.execute(
+            "SELECT COUNT(*) FROM sqlite_master"
+            " WHERE type = 'table' AND name = 'crash_history'"
+        )
+        fresh_database = cursor.fetchone()[0] == 0
+
+        self._conn.executescript(_SQL_SCHEMA)
+
+        # One-shot migration: databases written before crash_time became
+        # an INTEGER epoch hold ISO-8601 strings; rewrite them in place.
+        # The strings were naive local times (stored via the sqlite3
+        # datetime adapter), so convert per row in Python — SQLite's
+        # strftime('%s', ...) would read them as UTC and shift every
+        # row by the local offset.
+        rows = self._conn.execute(
+            "SELECT id, crash_time FROM crash_history"
+            " WHERE typeof(crash_time) = 'text'"
+        ).fetchall()
+        if rows:
+            updates = [
+                (int(datetime.fromisoformat(value).timestamp()), row_id)
+                for row_id, value in rows
+            ]
+            with self._conn:
+                self._conn.executemany(
+                    "UPDATE crash_history SET crash_time = ? WHERE id = ?",
+                    updates,
+                )
+            logger.info("Migrated crash_time column to unix timestamps")
+
+        if fresh_database:
+            # Seed sqlite_stat1 so the planner prefers the indexes from
+            # the first query rather than after the first optimize pass
+            self._conn.execute("ANALYZE crash_history")
+            self._conn.commit()
 
         logger.debug(f"Database initialized: {self.db_path}")
 
-    def save_analysis(self, result: AnalysisResult) -> int:
-        """Save analysis result to database.
-
-        Args:
-            result: AnalysisResult to save
-
-        Returns:
-            ID of inserted record
-        """
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-
-        # Serialize analysis result to JSON
+    @staticmethod
+    def _row_to_history(row: sqlite3.Row) -> CrashHistory:
+        """Build a CrashHistory record from a crash_history row."""
+        return CrashHistory(
+            id=row["id"],
+            dump_file_path=row["dump_file_path"],
+            crash_time=datetime.fromtimestamp(row["crash_time"]),
+            bugcheck_code=row["bugcheck_code"],
+            bugcheck_name=row["bugcheck_name"],
+            suspected_driver=row["suspected_driver"],
+            confidence=row["confidence"],
+            analysis_result=row["analysis_result"],
+        )
+
+    @staticmethod
+    def _insert_row(result: AnalysisResult) -> tuple:
+        """Build the parameter tuple for one _SQL_INSERT row."""
+        # Serialize analysis result to compact JSON: the driver list
+        # dominates the payload, so drivers are stored as
+        # [name, base_address, size] triples instead of keyed objects
         analysis_json = json.dumps({
             "suspected_cause": result.suspected_cause,
             "recommendations": result.recommendations,
             "loaded_drivers": [
-                {
-                    "name": d.name,
-                    "base_address": d.base_address,
-                    "size": d.size,
-                }
-                for d in result.loaded_drivers
+                _DRIVER_FIELDS(d) for d in result.loaded_drivers
             ],
-        }, ensure_ascii=False)
-
-        cursor.execute("""
-            INSERT INTO crash_history (
-                dump_file_path, crash_time, bugcheck_code, bugcheck_name,
-                suspected_driver, confidence, analysis_result, ai_analysis
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
+        }, ensure_ascii=False, separators=(",", ":"))
+
+        return (
             result.dump_file,
-            result.minidump_info.timestamp,
+            int(result.minidump_info.timestamp.timestamp()),
             result.crash_info.bugcheck_code,
             result.crash_info.bugcheck_name,
             result.suspected_driver.name if result.suspected_driver else None,
             result.confidence,
             analysis_json,
             result.ai_analysis,
-        ))
+        )
+
+    def save_analysis(self, result: AnalysisResult) -> int:
+        """Save analysis result to database.
+
+        Args:
+            result: AnalysisResult to save
+
+        Returns:
+            ID of inserted record
+        """
+        return self.save_analyses([result])[0]
 
-        record_id = cursor.lastrowid
-        conn.commit()
-        conn.close()
+    def save_analyses(self, results: List[AnalysisResult]) -> List[int]:
+        """Save a batch of analysis results in one transaction.
 
-        logger.info(f"Saved analysis to database (ID: {record_id})")
-        return record_id
+        Bulk ingest (e.g. scanning a minidump directory) would
+        otherwise pay a commit per row; executemany inserts the whole
+        batch and commits once.
+
+        Args:
+            results: AnalysisResults to save
+
+        Returns:
+            IDs of the inserted records, in input order
+        """
+        if not results:
+            return []
+
+        rows = [self._insert_row(result) for result in results]
+
+        with self._lock:
+            self._conn.executemany(_SQL_INSERT, rows)
+            # executemany does not report per-row lastrowid; the lock
+            # makes us the only writer, so the newest len(rows) ids are
+            # ours, in insertion order
+            cursor = self._conn.execute(
+                "SELECT id FROM crash_history ORDER BY id DESC LIMIT ?",
+                (len(rows),),
+            )
+            record_ids = [row[0] for row in cursor][::-1]
+            self._conn.commit()
+
+        logger.info(f"Saved {len(record_ids)} analyses to database (IDs: {record_ids[0]}..{record_ids[-1]})")
+        return record_ids
 
     def get_crash_history(self, limit: int = 20, days: Optional[int] = None) -> List[CrashHistory]:
         """Get crash history from database.
@@ -130,36 +371,18 @@ class DatabaseManager:
         Returns:
             List of CrashHistory records
         """
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-
-        query = "SELECT * FROM crash_history"
-        params = []
-
         if days is not None:
-            cutoff_time = datetime.now() - timedelta(days=days)
-            query += " WHERE crash_time >= ?"
-            params.append(cutoff_time.isoformat())
-
-        query += " ORDER BY crash_time DESC LIMIT ?"
-        params.append(limit)
-
-        cursor.execute(query, params)
-        rows = cursor.fetchall()
-        conn.close()
-
-        records = []
-        for row in rows:
-            records.append(CrashHistory(
-                id=row[0],
-                dump_file_path=row[1],
-                crash_time=datetime.fromisoformat(row[2]),
-                bugcheck_code=row[3],
-                bugcheck_name=row[4],
-                suspected_driver=row[5],
-                confidence=row[6],
-                analysis_result=row[7],
-            ))
+            query = _SQL_SELECT_HISTORY_DAYS
+            params = (int(time.time()) - days * 86400, limit)
+        else:
+            query = _SQL_SELECT_HISTORY
+            params = (limit,)
+
+        with self._readers.connection() as conn:
+            # Iterate the cursor directly: rows stream out of SQLite
+            # without a second fetchall materialization
+            cursor = conn.execute(query, params)
+            records = [self._row_to_history(row) for row in cursor]
 
         logger.debug(f"Retrieved {len(records)} crash records")
         return records
@@ -173,53 +396,38 @@ class DatabaseManager:
         Returns:
             Dictionary with statistics
         """
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-
-        cutoff_time = datetime.now() - timedelta(days=days)
-
-        # Total crashes
-        cursor.execute("""
-            SELECT COUNT(*) FROM crash_history
-            WHERE crash_time >= ?
-        """, (cutoff_time.isoformat(),))
-        total = cursor.fetchone()[0]
-
-        # Most common bugcheck codes
-        cursor.execute("""
-            SELECT bugcheck_code, bugcheck_name, COUNT(*) as count
-            FROM crash_history
-            WHERE crash_time >= ?
-            GROUP BY bugcheck_code, bugcheck_name
-            ORDER BY count DESC
-            LIMIT 5
-        """, (cutoff_time.isoformat(),))
-        bugcheck_stats = cursor.fetchall()
-
-        # Most common drivers
-        cursor.execute("""
-            SELECT suspected_driver, COUNT(*) as count
-            FROM crash_history
-            WHERE crash_time >= ? AND suspected_driver IS NOT NULL
-            GROUP BY suspected_driver
-            ORDER BY count DESC
-            LIMIT 5
-        """, (cutoff_time.isoformat(),))
-        driver_stats = cursor.fetchall()
-
-        conn.close()
+        # crash_time is an integer epoch, so the cutoff is plain
+        # arithmetic instead of a datetime/timedelta round trip
+        cutoff = int(time.time()) - days * 86400
+
+        total = 0
+        bugcheck_distribution = []
+        driver_distribution = []
+        with self._readers.connection() as conn:
+            # A single statement is one round-trip and one snapshot;
+            # the handful of summary rows are dispatched straight off
+            # the cursor without a fetchall materialization
+            rows = conn.execute(_SQL_STATS, {"cutoff": cutoff})
+
+            for kind, a, b, count in rows:
+                if kind == "total":
+                    total = count
+                elif kind == "bugcheck":
+                    bugcheck_distribution.append(
+                        {"code": f"0x{a:02X}", "name": b, "count": count}
+                    )
+                else:
+                    driver_distribution.append({"driver": a, "count": count})
+
+        # UNION ALL does not promise to keep the subquery ordering
+        bugcheck_distribution.sort(key=lambda e: e["count"], reverse=True)
+        driver_distribution.sort(key=lambda e: e["count"], reverse=True)
 
         return {
             "period_days": days,
             "total_crashes": total,
-            "bugcheck_distribution": [
-                {"code": f"0x{row[0]:02X}", "name": row[1], "count": row[2]}
-                for row in bugcheck_stats
-            ],
-            "driver_distribution": [
-                {"driver": row[0], "count": row[1]}
-                for row in driver_stats
-            ],
+            "bugcheck_distribution": bugcheck_distribution,
+            "driver_distribution": driver_distribution,
         }
 
     def clear_old_records(self, days: int = 90) -> int:
@@ -231,19 +439,14 @@ class DatabaseManager:
         Returns:
             Number of deleted records
         """
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-
-        cutoff_time = datetime.now() - timedelta(days=days)
+        cutoff = int(time.time()) - days * 86400
 
-        cursor.execute("""
-            DELETE FROM crash_history
-            WHERE crash_time < ?
-        """, (cutoff_time.isoformat(),))
-
-        deleted_count = cursor.rowcount
-        conn.commit()
-        conn.close()
+        with self._lock:
+            # Connection-as-context-manager: one explicit transaction,
+            # committed on success and rolled back on error
+            with self._conn:
+                cursor = self._conn.execute(_SQL_DELETE_OLD, (cutoff,))
+                deleted_count = cursor.rowcount
 
         logger.info(f"Deleted {deleted_count} old crash records")
         return deleted_count
@@ -257,24 +460,7 @@ class DatabaseManager:
         Returns:
             CrashHistory record or None
         """
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-
-        cursor.execute("""
-            SELECT * FROM crash_history WHERE id = ?
-        """, (record_id,))
-        row = cursor.fetchone()
-        conn.close()
-
-        if row:
-            return CrashHistory(
-                id=row[0],
-                dump_file_path=row[1],
-                crash_time=datetime.fromisoformat(row[2]),
-                bugcheck_code=row[3],
-                bugcheck_name=row[4],
-                suspected_driver=row[5],
-                confidence=row[6],
-                analysis_result=row[7],
-            )
-        return None
+        with self._readers.connection() as conn:
+            row = conn.execute(_SQL_BY_ID, (record_id,)).fetchone()
+
+        return self._row_to_history(row) if row else None
@@ -31,7 +31,7 @@ class BugCheckCode(Enum):
     ATTEMPTED_EXECUTE_OF_NOEXECUTE_MEMORY = 0xFC
 
 
-@dataclass
+@dataclass(slots=True)
 class MinidumpInfo:
     """Basic information about a minidump file."""
 
@@ -45,7 +45,7 @@ class MinidumpInfo:
     physical_memory: int
 
 
-@dataclass
+@dataclass(slots=True)
 class CrashInfo:
     """Crash information extracted from dump."""
 
@@ -59,7 +59,7 @@ class CrashInfo:
     parameters: List[int] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(slots=True)
 class DriverInfo:
     """Driver/module information."""
 
@@ -71,9 +71,14 @@ class DriverInfo:
     company: Optional[str] = None
     is_signed: bool = False
     is_problematic: bool = False
+    # Lowered name computed once; the detector compares it constantly
+    name_lower: str = field(init=False, repr=False, compare=False)
 
+    def __post_init__(self):
+        self.name_lower = self.name.lower()
 
-@dataclass
+
+@dataclass(slots=True)
 class StackFrame:
     """Single stack frame."""
 
@@ -85,7 +90,7 @@ class StackFrame:
     line_number: Optional[int] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class StackTrace:
     """Stack trace information."""
 
@@ -93,7 +98,7 @@ class StackTrace:
     frames: List[StackFrame]
 
 
-@dataclass
+@dataclass(slots=True)
 class AnalysisResult:
     """Complete analysis result."""
 
@@ -110,7 +115,7 @@ class AnalysisResult:
     analyzed_at: datetime = field(default_factory=datetime.now)
 
 
-@dataclass
+@dataclass(slots=True)
 class CrashHistory:
     """Crash history record for database."""
 
@@ -2,72 +2,98 @@
 Configuration management for BSOD Analyzer.
 
 Loads settings from environment variables and .env file.
+
+pydantic_settings and dotenv are imported on first use: the Config
+class is built inside get_config(), so headless callers that only
+need the database manager skip the pydantic import chain at startup.
 """
 
-import os
+from functools import cached_property, lru_cache
 from pathlib import Path
 from typing import Optional
 
-from pydantic_settings import BaseSettings, SettingsConfigDict
-from dotenv import load_dotenv
 
+def _build_config_class():
+    """Define the Config class (imports pydantic_settings)."""
+    from pydantic_settings import BaseSettings, SettingsConfigDict
+
+    class Config(BaseSettings):
+        """Application configuration."""
+
+        model_config = SettingsConfigDict(
+            env_file=".env",
+            env_file_encoding="utf-8",
+            case_sensitive=False,
+            extra="ignore",
+            # Immutable after construction, so derived values (the
+            # expanded database path) can be cached safely
+            frozen=True,
+        )
+
+        # AI configuration
+        zhipu_api_key: Optional[str] = None
+        ai_model: str = "glm-4.7"
+        ai_max_tokens: int = 2048
+        ai_cache_enabled: bool = True
+        ai_cache_ttl: int = 86400  # seconds
+        ai_semantic_cache: bool = False  # also hit on near-duplicate prompts
 
-class Config(BaseSettings):
-    """Application configuration."""
+        # Database configuration
+        database_path: str = "~/.bsod_analyzer/crashes.db"
 
-    model_config = SettingsConfigDict(
-        env_file=".env",
-        env_file_encoding="utf-8",
-        case_sensitive=False,
-        extra="ignore",
-    )
+        # Logging configuration
+        log_level: str = "INFO"
+        log_file: Optional[str] = None
 
-    # AI configuration
-    zhipu_api_key: Optional[str] = None
-    ai_model: str = "glm-4.7"
-    ai_max_tokens: int = 2048
+        # Analysis configuration
+        default_dump_dir: str = "C:/Windows/Minidump"
+        max_stack_frames: int = 10
+        confidence_threshold: float = 0.6
 
-    # Database configuration
-    database_path: str = "~/.bsod_analyzer/crashes.db"
+        @cached_property
+        def _database_path(self) -> Path:
+            return Path(self.database_path).expanduser()
 
-    # Logging configuration
-    log_level: str = "INFO"
-    log_file: Optional[str] = None
+        def get_database_path(self) -> Path:
+            """Get expanded database path (expanded once, then cached)."""
+            return self._database_path
 
-    # Analysis configuration
-    default_dump_dir: str = "C:/Windows/Minidump"
-    max_stack_frames: int = 10
-    confidence_threshold: float = 0.6
+        def get_ai_config(self) -> dict:
+            """Get AI configuration for provider."""
+            return {
+                "api_key": self.zhipu_api_key,
+                "model": self.ai_model,
+                "max_tokens": self.ai_max_tokens,
+            }
 
-    def get_database_path(self) -> Path:
-        """Get expanded database path."""
-        return Path(self.database_path).expanduser()
+    return Config
 
-    def get_ai_config(self) -> dict:
-        """Get AI configuration for provider."""
-        return {
-            "api_key": self.zhipu_api_key,
-            "model": self.ai_model,
-            "max_tokens": self.ai_max_tokens,
-        }
 
+# Built on first get_config() call
+_config_cls = None
 
-# Global config instance
-_config: Optional[Config] = None
 
+def _config_class():
+    """Get the Config class, building it on first use."""
+    global _config_cls
+    if _config_cls is None:
+        _config_cls = _build_config_class()
+    return _config_cls
 
-def get_config() -> Config:
+
+@lru_cache(maxsize=1)
+def get_config() -> "Config":
     """Get global configuration instance."""
-    global _config
-    if _config is None:
-        load_dotenv()
-        _config = Config()
-    return _config
+    from dotenv import load_dotenv
+
+    load_dotenv()
+    return _config_class()()
 
 
-def reload_config() -> Config:
+def reload_config() -> "Config":
     """Reload configuration from environment."""
-    global _config
+    from dotenv import load_dotenv
+
     load_dotenv(override=True)
-    _config = Config()
-    return _config
+    get_config.cache_clear()
+    return get_config()
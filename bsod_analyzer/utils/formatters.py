@@ -5,16 +5,79 @@ Provides functions to format results for different output types.
 """
 
 import json
+from datetime import datetime
 from typing import Dict, Any
-from rich.console import Console
-from rich.table import Table
-from rich.panel import Panel
-from rich.syntax import Syntax
 
-from bsod_analyzer.database.models import AnalysisResult
+from bsod_analyzer.database.models import AnalysisResult, BugCheckCode
 
+# Common bugcheck codes pre-rendered once; the history table and the
+# report headers format the same dozen codes over and over
+_BUGCHECK_HEX = {c.value: f"0x{c.value:02X}" for c in BugCheckCode}
 
-console = Console()
+
+def _bugcheck_hex(code: int) -> str:
+    """Format a bugcheck code, served from the precomputed table."""
+    return _BUGCHECK_HEX.get(code) or f"0x{code:02X}"
+
+
+# Rich is only needed by the display_* functions, so it is imported on
+# first use: headless callers (format_*/save_result_to_file) skip the
+# whole rich import chain at startup.
+_console = None
+
+
+def _get_console():
+    """Return the shared rich Console, importing rich on first use."""
+    global _console
+    if _console is None:
+        from rich.console import Console
+
+        _console = Console()
+    return _console
+
+
+_TEXT_SEP = "=" * 70
+
+# The whole plain-text report as one %-template: a single substitution
+# replaces ~30 list appends and per-line f-strings. Optional sections
+# (driver, AI) slot into %s placeholders as pre-rendered sub-templates
+# or empty strings.
+_TEXT_REPORT_TMPL = _TEXT_SEP + """
+Windows蓝屏分析报告
+""" + _TEXT_SEP + """
+
+【基本信息】
+  文件: %s
+  时间: %s
+  计算机: %s
+  系统: %s
+  CPU: %s (%d 核心)
+  内存: %d MB
+
+【崩溃信息】
+  Bugcheck代码: %s
+  名称: %s
+  描述: %s
+  崩溃地址: 0x%X
+
+%s【崩溃原因】
+  %s
+
+【修复建议】%s
+
+【分析置信度】: %.1f%%
+%s
+""" + _TEXT_SEP
+
+_TEXT_DRIVER_TMPL = """【疑似问题驱动】
+  名称: %s
+  基地址: 0x%X
+  大小: %s 字节
+  已知问题: %s
+
+"""
+
+_TEXT_AI_TMPL = "\n【AI分析】\n%s\n"
 
 
 def format_analysis_result(result: AnalysisResult) -> Dict[str, Any]:
@@ -32,7 +95,7 @@ def format_analysis_result(result: AnalysisResult) -> Dict[str, Any]:
         "computer_name": result.minidump_info.computer_name,
         "os_version": result.minidump_info.os_version,
         "bugcheck": {
-            "code": f"0x{result.crash_info.bugcheck_code:02X}",
+            "code": _bugcheck_hex(result.crash_info.bugcheck_code),
             "name": result.crash_info.bugcheck_name,
             "description": result.crash_info.bugcheck_description,
             "crash_address": f"0x{result.crash_info.crash_address:X}",
@@ -59,61 +122,43 @@ def format_text_output(result: AnalysisResult) -> str:
     Returns:
         Formatted text string
     """
-    lines = [
-        "=" * 70,
-        "Windows蓝屏分析报告",
-        "=" * 70,
-        "",
-        "【基本信息】",
-        f"  文件: {result.dump_file}",
-        f"  时间: {result.minidump_info.timestamp}",
-        f"  计算机: {result.minidump_info.computer_name}",
-        f"  系统: {result.minidump_info.os_version}",
-        f"  CPU: {result.minidump_info.cpu_architecture} ({result.minidump_info.number_of_processors} 核心)",
-        f"  内存: {result.minidump_info.physical_memory // (1024*1024)} MB",
-        "",
-        "【崩溃信息】",
-        f"  Bugcheck代码: 0x{result.crash_info.bugcheck_code:02X}",
-        f"  名称: {result.crash_info.bugcheck_name}",
-        f"  描述: {result.crash_info.bugcheck_description}",
-        f"  崩溃地址: 0x{result.crash_info.crash_address:X}",
-        "",
-    ]
+    info = result.minidump_info
+    crash = result.crash_info
 
     if result.suspected_driver:
-        lines.extend([
-            "【疑似问题驱动】",
-            f"  名称: {result.suspected_driver.name}",
-            f"  基地址: 0x{result.suspected_driver.base_address:X}",
-            f"  大小: {result.suspected_driver.size:,} 字节",
-            f"  已知问题: {'是' if result.suspected_driver.is_problematic else '否'}",
-            "",
-        ])
-
-    lines.extend([
-        "【崩溃原因】",
-        f"  {result.suspected_cause}",
-        "",
-        "【修复建议】",
-    ])
-
-    for i, rec in enumerate(result.recommendations, 1):
-        lines.append(f"  {i}. {rec}")
-
-    lines.append("")
-    lines.append(f"【分析置信度】: {result.confidence:.1%}")
-
-    if result.ai_analysis:
-        lines.extend([
-            "",
-            "【AI分析】",
-            result.ai_analysis,
-        ])
-
-    lines.append("")
-    lines.append("=" * 70)
+        driver = result.suspected_driver
+        driver_section = _TEXT_DRIVER_TMPL % (
+            driver.name,
+            driver.base_address,
+            format(driver.size, ","),
+            "是" if driver.is_problematic else "否",
+        )
+    else:
+        driver_section = ""
 
-    return "\n".join(lines)
+    recommendations = "".join(
+        "\n  %d. %s" % item for item in enumerate(result.recommendations, 1)
+    )
+    ai_section = _TEXT_AI_TMPL % result.ai_analysis if result.ai_analysis else ""
+
+    return _TEXT_REPORT_TMPL % (
+        result.dump_file,
+        info.timestamp,
+        info.computer_name,
+        info.os_version,
+        info.cpu_architecture,
+        info.number_of_processors,
+        info.physical_memory // (1024 * 1024),
+        _bugcheck_hex(crash.bugcheck_code),
+        crash.bugcheck_name,
+        crash.bugcheck_description,
+        crash.crash_address,
+        driver_section,
+        result.suspected_cause,
+        recommendations,
+        result.confidence * 100,
+        ai_section,
+    )
 
 
 def display_analysis_result_rich(result: AnalysisResult):
@@ -122,6 +167,11 @@ def display_analysis_result_rich(result: AnalysisResult):
     Args:
         result: AnalysisResult to display
     """
+    from rich.panel import Panel
+    from rich.table import Table
+
+    console = _get_console()
+
     # Basic info panel
     info_table = Table(show_header=False, box=None, padding=(0, 2))
     info_table.add_row("文件:", result.dump_file)
@@ -194,19 +244,33 @@ def display_crash_history(records):
     Args:
         records: List of CrashHistory records
     """
+    from rich.table import Table
+
+    console = _get_console()
+
     table = Table(title="崩溃历史记录", show_header=True)
     table.add_column("时间", style="cyan")
     table.add_column("Bugcheck", style="red")
     table.add_column("疑似驱动", style="yellow")
     table.add_column("置信度", style="green")
 
-    for record in records:
-        table.add_row(
-            record.crash_time.strftime("%Y-%m-%d %H:%M"),
-            f"0x{record.bugcheck_code:02X}",
+    # Format the cells in one comprehension with strftime bound once,
+    # then feed add_row pre-built tuples: the per-row loop does no
+    # attribute lookups, which matters for a long scrollback
+    strftime = datetime.strftime
+    bugcheck_hex = _bugcheck_hex
+    rows = [
+        (
+            strftime(record.crash_time, "%Y-%m-%d %H:%M"),
+            bugcheck_hex(record.bugcheck_code),
             record.suspected_driver or "未知",
             f"{record.confidence:.0%}",
         )
+        for record in records
+    ]
+    add_row = table.add_row
+    for row in rows:
+        add_row(*row)
 
     console.print(table)
 
@@ -217,6 +281,11 @@ def display_statistics(stats: dict):
     Args:
         stats: Statistics dictionary
     """
+    from rich.panel import Panel
+    from rich.table import Table
+
+    console = _get_console()
+
     console.print(Panel(f"统计周期: {stats['period_days']} 天", title="崩溃统计"))
 
     # Total crashes
@@ -229,8 +298,13 @@ def display_statistics(stats: dict):
         table.add_column("名称")
         table.add_column("次数", style="yellow")
 
-        for item in stats["bugcheck_distribution"]:
-            table.add_row(item["code"], item["name"], str(item["count"]))
+        rows = [
+            (item["code"], item["name"], str(item["count"]))
+            for item in stats["bugcheck_distribution"]
+        ]
+        add_row = table.add_row
+        for row in rows:
+            add_row(*row)
 
         console.print(table)
 
@@ -240,8 +314,13 @@ def display_statistics(stats: dict):
         table.add_column("驱动", style="yellow")
         table.add_column("次数", style="red")
 
-        for item in stats["driver_distribution"]:
-            table.add_row(item["driver"], str(item["count"]))
+        rows = [
+            (item["driver"], str(item["count"]))
+            for item in stats["driver_distribution"]
+        ]
+        add_row = table.add_row
+        for row in rows:
+            add_row(*row)
 
         console.print(table)
 